@@ -1,4 +1,5 @@
 from .client import ElevenLabsClient
+from .tts import AsyncTtsApi
 
 
-__all__ = ["ElevenLabsClient",]
\ No newline at end of file
+__all__ = ["ElevenLabsClient", "AsyncTtsApi"]
\ No newline at end of file
@@ -1,15 +1,58 @@
 import os
-from elevenlabs.client import ElevenLabs
-from .tts import TtsApi
+from elevenlabs.client import AsyncElevenLabs, ElevenLabs
+from optimation_core import AudioCache, ConfigError
+from optimation_core.rate_limit import RateLimiter
+
+from .tts import AsyncTtsApi, TtsApi
 
 
 class ElevenLabsClient:
-    def __init__(self, client: ElevenLabs = None, api_key:str = None):
-        if api_key:
-            self._client = ElevenLabs(api_key=api_key),
+    def __init__(
+        self,
+        client: ElevenLabs = None,
+        api_key:str = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: AudioCache | None = None,
+        async_client: AsyncElevenLabs | None = None,
+        base_url: str | None = None,
+        timeout: float | None = None,
+    ):
+        """
+        api_key / base_url / timeout: options des clients construits ici (sync et atts).
+        Avec un `client` injecté, atts demande `async_client` (sa config n'est pas relue).
+        """
+        # Options gardées pour construire le client async à l'identique
+        self._options: dict = {"api_key": api_key or os.getenv("ELEVENLABS_API_KEY")}
+        if base_url is not None:
+            self._options["base_url"] = base_url
+        if timeout is not None:
+            self._options["timeout"] = timeout
+
+        self._injected = client is not None and not api_key
+        if self._injected:
+            self._client = client
+        else:
+            self._client = ElevenLabs(**self._options)
 
-        else:    
-            self._client = client or ElevenLabs(api_key=os.getenv("ELEVENLABS_API_KEY"))
+        self._async_client = async_client
+        self._rate_limiter = rate_limiter
+        self._cache = cache
+        self._atts: AsyncTtsApi | None = None
 
-        self.tts = TtsApi(client=self._client)
+        self.tts = TtsApi(client=self._client, rate_limiter=rate_limiter, cache=cache)
 
+    @property
+    def atts(self) -> AsyncTtsApi:
+        """TTS asyncio (AsyncElevenLabs), créé au premier usage, même quota et cache."""
+        if self._atts is None:
+            client = self._async_client
+            if client is None:
+                if self._injected:
+                    raise ConfigError(
+                        "ElevenLabsClient(client=...) needs async_client=... to use atts"
+                    )
+                client = AsyncElevenLabs(**self._options)
+            self._atts = AsyncTtsApi(
+                client=client, rate_limiter=self._rate_limiter, cache=self._cache
+            )
+        return self._atts
@@ -1 +1,19 @@
-from optimation_core import ConnectorError
\ No newline at end of file
+from elevenlabs.core.api_error import ApiError as ElevenLabsApiError
+
+from optimation_core import ConnectorError, RateLimitError
+from optimation_core.retry import parse_retry_after
+
+
+def _map_api_error(e: ElevenLabsApiError) -> ConnectorError:
+    body = e.body
+    detail = body.get("detail", body) if isinstance(body, dict) else body
+
+    # 429: quota / concurrence dépassés
+    if e.status_code == 429:
+        headers = {k.lower(): v for k, v in (e.headers or {}).items()}
+        return RateLimitError(
+            f"ElevenLabs rate limit (status=429) | {detail}",
+            retry_after=parse_retry_after(headers.get("retry-after")),
+        )
+
+    return ConnectorError(f"ElevenLabs API error (status={e.status_code}) | {detail}")
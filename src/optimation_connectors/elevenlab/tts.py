@@ -1,15 +1,41 @@
+import asyncio
 import os
-from typing import Literal
-from elevenlabs.client import ElevenLabs
+from typing import Any, AsyncIterator, BinaryIO, Callable, Iterable, Iterator, Literal, Union
+from elevenlabs.client import AsyncElevenLabs, ElevenLabs
+from elevenlabs.core.api_error import ApiError as ElevenLabsApiError
 from elevenlabs import VoiceSettings
 
+from optimation_core import AudioCache, CachedAudio
+from optimation_core.rate_limit import RateLimiter
+
+from .exceptions import _map_api_error
+
 VoiceName = Literal["marc-aurel-qc-en", "luna-qc-en","brittney-qc-en","lana-fr-en", "theodore-nt", "john-en-fr"]
-ModelName = Literal["eleven_multilingual_v2", "other"]
+ModelName = Literal["eleven_multilingual_v2", "eleven_flash_v2_5", "eleven_turbo_v2_5", "other"]
 LanguageCode = Literal["fr", "en", "es"]
+# pcm_*: aucun décodage côté client (le moins de CPU, le plus de bande passante);
+# opus_*: le plus compact; mp3_*: le plus compatible
+OutputFormat = Literal[
+    "mp3_22050_32", "mp3_44100_64", "mp3_44100_96", "mp3_44100_128", "mp3_44100_192",
+    "pcm_16000", "pcm_22050", "pcm_24000", "pcm_44100", "pcm_48000",
+    "opus_48000_32", "opus_48000_64", "opus_48000_96", "opus_48000_128",
+    "ulaw_8000",
+]
+# Fichier (chemin ou objet avec write), socket (sendall) ou callable(bytes)
+AudioSink = Union[str, os.PathLike, BinaryIO, Callable[[bytes], Any]]
 
-class TtsApi:
-    def __init__(self, client: ElevenLabs | None = None):
-        self._client = client or ElevenLabs(api_key=os.environ.get('ELEVENLABS_API_KEY'))
+class _BaseTtsApi:
+    def __init__(
+        self,
+        client: ElevenLabs | AsyncElevenLabs,
+        rate_limiter: RateLimiter | None = None,
+        cache: AudioCache | None = None,
+    ):
+        self._client = client
+        # Quota ElevenLabs = caractères: le bucket "tokens" compte des caractères ici
+        self._rate_limiter = rate_limiter
+        # Optionnel: cache d'audio partagé (disque); un hit ne consomme pas de quota
+        self._cache = cache
         self._voices: dict[VoiceName, str] = {
             "luna-qc-en": "iB0Pwf5VYt7UDBrGrMqH",
             "brittney-qc-en": "pjcYQlDFKMbcOUp6F5GD",
@@ -19,21 +45,294 @@ class TtsApi:
             "john-en-fr": "EryqBbKuawX5rMsewc7f",
         }
 
+    def _cache_key(
+        self,
+        text: str,
+        voice_id: str,
+        model: str,
+        language_code: str,
+        output_format: str,
+    ) -> str | None:
+        if self._cache is None:
+            return None
+        return AudioCache.key(
+            provider='elevenlabs',
+            model=model,
+            voice=voice_id,
+            language=language_code,
+            system_prompt=None,
+            text=text,
+            format=output_format,
+        )
+
+    def _stream_options(
+        self,
+        optimize_streaming_latency: int | None,
+        voice_settings: VoiceSettings | None,
+    ) -> dict[str, Any]:
+        options: dict[str, Any] = {}
+        if optimize_streaming_latency is not None:
+            options['optimize_streaming_latency'] = optimize_streaming_latency
+        if voice_settings is not None:
+            options['voice_settings'] = voice_settings
+        return options
+
+
+class TtsApi(_BaseTtsApi):
+    def __init__(
+        self,
+        client: ElevenLabs | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: AudioCache | None = None,
+    ):
+        super().__init__(
+            client or ElevenLabs(api_key=os.environ.get('ELEVENLABS_API_KEY')),
+            rate_limiter,
+            cache,
+        )
+
     def generate(
             self,
             text:str,
             voice:VoiceName = 'marc-aurel-qc-en',
             model:ModelName = 'eleven_multilingual_v2',
-            language_code: LanguageCode = 'en' 
-        ):
+            language_code: LanguageCode = 'en',
+            output_format: OutputFormat = 'mp3_44100_128',
+        ) -> Iterator[bytes]:
         voice_id = self._voices[voice]
 
-        return self._client.text_to_speech.convert(
+        cache_key = self._cache_key(text, voice_id, model, language_code, output_format)
+        # Hit servi depuis le fichier mappé, par chunks: jamais le clip entier en mémoire
+        if cache_key is not None and (audio := self._cache.open(cache_key)) is not None:
+            return _cached_chunks(audio)
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire(tokens=len(text))
+
+        chunks = _mapped(self._client.text_to_speech.convert(
             text=text,
             voice_id= voice_id,
             model_id=model,
             language_code=language_code,
-            output_format="mp3_44100_128",
+            output_format=output_format,
+        ))
+        if cache_key is None:
+            return chunks
+        return _caching(chunks, self._cache, cache_key, _mime_type(output_format))
+
+    def stream(
+            self,
+            text: str,
+            voice: VoiceName = 'marc-aurel-qc-en',
+            model: ModelName = 'eleven_flash_v2_5',
+            language_code: LanguageCode = 'en',
+            *,
+            output_format: OutputFormat = 'mp3_44100_128',
+            optimize_streaming_latency: int | None = 3,
+            voice_settings: VoiceSettings | None = None,
+        ) -> Iterator[bytes]:
+        """
+        Chunks audio au fil de la synthèse (text_to_speech.stream), réglé pour la latence:
+        modèle flash par défaut, optimize_streaming_latency (0 = off .. 4 = max, sans
+        normalisation du texte). Se passe tel quel à une réponse HTTP en streaming:
+
+            StreamingResponse(tts.stream(text), media_type="audio/mpeg")
+        """
+        voice_id = self._voices[voice]
+
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire(tokens=len(text))
+
+        return _mapped(self._client.text_to_speech.stream(
+            voice_id,
+            text=text,
+            model_id=model,
+            language_code=language_code,
+            output_format=output_format,
+            **self._stream_options(optimize_streaming_latency, voice_settings),
+        ))
+
+    def stream_to(self, sink: AudioSink, text: str, **options) -> int:
+        """
+        Écrit le flux de `stream` dans `sink` chunk par chunk (jamais le clip entier
+        en mémoire). Renvoie le nombre d'octets écrits.
+        """
+        if isinstance(sink, (str, os.PathLike)):
+            with open(sink, 'wb') as f:
+                return self.stream_to(f, text, **options)
+
+        write = _sink_writer(sink)
+        written = 0
+        for chunk in self.stream(text, **options):
+            write(chunk)
+            written += len(chunk)
+        return written
+
+
+class AsyncTtsApi(_BaseTtsApi):
+    """
+    Variante asyncio (AsyncElevenLabs): mêmes voix, erreurs, quota et cache que TtsApi.
+    generate/stream sont des générateurs asynchrones (`async for`).
+    """
+
+    def __init__(
+        self,
+        client: AsyncElevenLabs | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: AudioCache | None = None,
+    ):
+        super().__init__(
+            client or AsyncElevenLabs(api_key=os.environ.get('ELEVENLABS_API_KEY')),
+            rate_limiter,
+            cache,
+        )
+
+    async def generate(
+            self,
+            text: str,
+            voice: VoiceName = 'marc-aurel-qc-en',
+            model: ModelName = 'eleven_multilingual_v2',
+            language_code: LanguageCode = 'en',
+            output_format: OutputFormat = 'mp3_44100_128',
+        ) -> AsyncIterator[bytes]:
+        voice_id = self._voices[voice]
+
+        cache_key = self._cache_key(text, voice_id, model, language_code, output_format)
+        # Lecture / écriture du cache (SQLite + fichiers) hors de la boucle
+        if cache_key is not None and (
+            cached := await asyncio.to_thread(self._cache.get, cache_key)
+        ) is not None:
+            yield cached[0]
+            return
+
+        if self._rate_limiter is not None:
+            await self._rate_limiter.aacquire(tokens=len(text))
+
+        received = []
+        async for chunk in _amapped(self._client.text_to_speech.convert(
+            text=text,
+            voice_id=voice_id,
+            model_id=model,
+            language_code=language_code,
+            output_format=output_format,
+        )):
+            if cache_key is not None:
+                received.append(chunk)
+            yield chunk
+        if cache_key is not None:
+            await asyncio.to_thread(
+                self._cache.set, cache_key, b"".join(received), _mime_type(output_format)
+            )
+
+    async def stream(
+            self,
+            text: str,
+            voice: VoiceName = 'marc-aurel-qc-en',
+            model: ModelName = 'eleven_flash_v2_5',
+            language_code: LanguageCode = 'en',
+            *,
+            output_format: OutputFormat = 'mp3_44100_128',
+            optimize_streaming_latency: int | None = 3,
+            voice_settings: VoiceSettings | None = None,
+        ) -> AsyncIterator[bytes]:
+        """Comme TtsApi.stream; se passe tel quel à une StreamingResponse."""
+        voice_id = self._voices[voice]
+
+        if self._rate_limiter is not None:
+            await self._rate_limiter.aacquire(tokens=len(text))
+
+        async for chunk in _amapped(self._client.text_to_speech.stream(
+            voice_id,
+            text=text,
+            model_id=model,
+            language_code=language_code,
+            output_format=output_format,
+            **self._stream_options(optimize_streaming_latency, voice_settings),
+        )):
+            yield chunk
+
+    async def synthesize(self, text: str, **options) -> bytes:
+        """Clip complet (generate rassemblé)."""
+        return b"".join([chunk async for chunk in self.generate(text, **options)])
+
+    async def synthesize_many(
+        self,
+        texts: Iterable[str],
+        *,
+        concurrency: int = 4,
+        return_exceptions: bool = False,
+        **options,
+    ) -> list[bytes | BaseException]:
+        """
+        Plusieurs clips via asyncio.gather (ordre d'entrée), au plus `concurrency` en vol.
+        return_exceptions=True: une erreur prend la place de son résultat.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(text: str) -> bytes:
+            async with semaphore:
+                return await self.synthesize(text, **options)
+
+        return await asyncio.gather(
+            *(run(text) for text in texts), return_exceptions=return_exceptions
         )
-        
 
+
+def _mapped(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    # Le SDK est paresseux: la requête (et ses erreurs) arrive au premier chunk
+    try:
+        yield from chunks
+    except ElevenLabsApiError as e:
+        raise _map_api_error(e) from e
+
+
+async def _amapped(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in chunks:
+            yield chunk
+    except ElevenLabsApiError as e:
+        raise _map_api_error(e) from e
+
+
+def _cached_chunks(audio: CachedAudio, chunk_size: int = 64 * 1024) -> Iterator[bytes]:
+    try:
+        for view in audio.chunks(chunk_size):
+            with view:  # vue libérée avant close(): le mmap ne peut pas être fermé sinon
+                chunk = bytes(view)
+            yield chunk
+    finally:
+        audio.close()
+
+
+def _caching(
+    chunks: Iterator[bytes], cache: AudioCache, key: str, mime_type: str
+) -> Iterator[bytes]:
+    # Rendu au fil de l'eau; mis en cache seulement si le flux est allé au bout
+    received = []
+    for chunk in chunks:
+        received.append(chunk)
+        yield chunk
+    cache.set(key, b"".join(received), mime_type)
+
+
+def _mime_type(output_format: str) -> str:
+    codec, _, rest = output_format.partition('_')
+    if codec == 'pcm':
+        return f"audio/L16;rate={rest}"
+    return {
+        'mp3': 'audio/mpeg',
+        'opus': 'audio/ogg',
+        'ulaw': 'audio/basic',
+        'alaw': 'audio/x-alaw-basic',
+        'wav': 'audio/wav',
+    }.get(codec, 'application/octet-stream')
+
+
+def _sink_writer(sink: AudioSink) -> Callable[[bytes], Any]:
+    if hasattr(sink, 'sendall'):  # socket
+        return sink.sendall
+    if hasattr(sink, 'write'):
+        return sink.write
+    if callable(sink):
+        return sink
+    raise TypeError(f"Unsupported audio sink: {type(sink).__name__}")
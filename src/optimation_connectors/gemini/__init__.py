@@ -1,4 +1,9 @@
 from .client import GeminiClient
-from .exceptions import ResourceExhausted, ConnectorError
+from .tts import AsyncTtsApi
+from .audio import Mp3Encoder, Mp3EncoderPool
+from .exceptions import ResourceExhausted, ConnectorError, AudioEncodeError
 
-__all__ = ['GeminiClient', 'ResourceExhausted', "ConnectorError"]
\ No newline at end of file
+__all__ = [
+    'GeminiClient', 'AsyncTtsApi', 'ResourceExhausted', "ConnectorError", 'AudioEncodeError',
+    'Mp3Encoder', 'Mp3EncoderPool',
+]
\ No newline at end of file
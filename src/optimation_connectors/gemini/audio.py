@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import asyncio
+import io
+import subprocess
+import threading
+import wave
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Iterator, Literal, Optional
+
+try:  # encodeur MP3 en process, optionnel: pip install optimation-python-sdk[mp3]
+    import lameenc
+except ImportError:
+    lameenc = None
+
+from .exceptions import AudioEncodeError
+
+EncoderBackend = Literal["auto", "lameenc", "ffmpeg"]
+
+# lameenc: mode VBR "mtrh" (le défaut de lame / ffmpeg -q:a)
+_LAME_VBR_MTRH = 4
+
+
+class Mp3Encoder:
+    """
+    Encodage WAV (PCM 16 bits) -> MP3, sans fichier temporaire.
+    - backend="lameenc": en process (pas de sous-processus), si lameenc est installé
+    - backend="ffmpeg": WAV sur stdin, MP3 sur stdout; stderr remonté dans AudioEncodeError
+    - "auto": lameenc si disponible, sinon ffmpeg
+    quality: qualité VBR lame (0 = meilleure, 9 = plus petite), comme `ffmpeg -q:a`.
+    """
+
+    def __init__(
+        self,
+        *,
+        backend: EncoderBackend = "auto",
+        quality: int = 3,
+        ffmpeg: str = "ffmpeg",
+        timeout_s: Optional[float] = 120.0,
+    ) -> None:
+        if backend == "lameenc" and lameenc is None:
+            raise ImportError("lameenc is not installed (pip install optimation-python-sdk[mp3])")
+        if backend == "auto":
+            backend = "lameenc" if lameenc is not None else "ffmpeg"
+        self.backend = backend
+        self.quality = quality
+        self.ffmpeg = ffmpeg
+        self.timeout_s = timeout_s
+
+    def encode(self, wav_bytes: bytes) -> bytes:
+        if self.backend == "lameenc":
+            return self._encode_lameenc(wav_bytes)
+        return self._encode_ffmpeg(wav_bytes)
+
+    async def aencode(self, wav_bytes: bytes) -> bytes:
+        """Sans bloquer la boucle: lameenc dans un thread, ffmpeg en sous-processus asyncio."""
+        if self.backend == "lameenc":
+            return await asyncio.to_thread(self._encode_lameenc, wav_bytes)
+
+        command = self._ffmpeg_command(["-f", "wav"])
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *command,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+        except FileNotFoundError as e:
+            raise AudioEncodeError(
+                f"ffmpeg not found ({self.ffmpeg!r}); install it or lameenc"
+            ) from e
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(wav_bytes), self.timeout_s)
+        except asyncio.TimeoutError as e:
+            raise AudioEncodeError(f"ffmpeg timed out after {self.timeout_s}s") from e
+        finally:
+            if proc.returncode is None:  # timeout ou annulation
+                proc.kill()
+                await proc.wait()
+
+        self._check(proc.returncode, bool(stdout), stderr)
+        return stdout
+
+    def _encode_lameenc(self, wav_bytes: bytes) -> bytes:
+        try:
+            with wave.open(io.BytesIO(wav_bytes)) as w:
+                if w.getsampwidth() != 2:
+                    raise AudioEncodeError(
+                        f"lameenc needs 16-bit PCM, got {8 * w.getsampwidth()}-bit"
+                    )
+                channels, sample_rate = w.getnchannels(), w.getframerate()
+                pcm = w.readframes(w.getnframes())
+        except (wave.Error, EOFError) as e:
+            raise AudioEncodeError(f"Invalid WAV input: {e}") from e
+
+        encoder = self._lame_encoder(sample_rate, channels)
+        try:
+            return bytes(encoder.encode(pcm) + encoder.flush())
+        except RuntimeError as e:
+            raise AudioEncodeError(f"lameenc failed: {e}") from e
+
+    def encode_stream(
+        self,
+        pcm_chunks: Iterable[bytes],
+        *,
+        sample_rate: int,
+        channels: int = 1,
+        sample_width: int = 2,
+    ) -> Iterator[bytes]:
+        """
+        Encodage incrémental: PCM brut (16 bits LE) en entrée, trames MP3 rendues dès
+        qu'elles sont prêtes. Avec ffmpeg, `pcm_chunks` est lu dans un thread dédié
+        (écriture sur stdin pendant qu'on lit stdout); ses erreurs sont remontées ici.
+        """
+        if sample_width != 2:
+            raise AudioEncodeError(f"MP3 encoding needs 16-bit PCM, got {8 * sample_width}-bit")
+        if self.backend == "lameenc":
+            return self._stream_lameenc(pcm_chunks, sample_rate, channels)
+        return self._stream_ffmpeg(pcm_chunks, sample_rate, channels)
+
+    def _lame_encoder(self, sample_rate: int, channels: int):
+        encoder = lameenc.Encoder()
+        encoder.set_in_sample_rate(sample_rate)
+        encoder.set_channels(channels)
+        encoder.set_vbr(_LAME_VBR_MTRH)
+        encoder.set_vbr_quality(self.quality)
+        return encoder
+
+    def _stream_lameenc(
+        self, pcm_chunks: Iterable[bytes], sample_rate: int, channels: int
+    ) -> Iterator[bytes]:
+        encoder = self._lame_encoder(sample_rate, channels)
+        align = 2 * channels
+        carry = b""
+        try:
+            for chunk in pcm_chunks:
+                # un échantillon peut être coupé entre deux chunks réseau
+                data = carry + bytes(chunk) if carry else bytes(chunk)
+                cut = len(data) - len(data) % align
+                carry = data[cut:]
+                if cut and (out := encoder.encode(data[:cut])):
+                    yield bytes(out)
+            if tail := encoder.flush():
+                yield bytes(tail)
+        except RuntimeError as e:
+            raise AudioEncodeError(f"lameenc failed: {e}") from e
+
+    def _stream_ffmpeg(
+        self, pcm_chunks: Iterable[bytes], sample_rate: int, channels: int
+    ) -> Iterator[bytes]:
+        command = self._ffmpeg_command(
+            ["-f", "s16le", "-ar", str(sample_rate), "-ac", str(channels)]
+        )
+        proc = self._spawn(command)
+        feed_errors: list[BaseException] = []
+        stderr: list[bytes] = []
+
+        def feed() -> None:
+            try:
+                for chunk in pcm_chunks:
+                    proc.stdin.write(chunk)
+            except BrokenPipeError:
+                pass  # ffmpeg a quitté: le code de sortie dira pourquoi
+            except BaseException as e:
+                feed_errors.append(e)
+            finally:
+                try:
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass
+
+        threads = [
+            threading.Thread(target=feed, daemon=True),
+            threading.Thread(target=lambda: stderr.append(proc.stderr.read()), daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            while data := proc.stdout.read1(64 * 1024):
+                yield data
+            proc.wait(timeout=self.timeout_s)
+            for thread in threads:
+                thread.join()
+        except subprocess.TimeoutExpired as e:
+            raise AudioEncodeError(f"ffmpeg timed out after {self.timeout_s}s") from e
+        finally:
+            if proc.poll() is None:  # consommateur parti avant la fin
+                proc.kill()
+                proc.wait()
+
+        if feed_errors:
+            raise feed_errors[0]
+        self._check(proc.returncode, True, b"".join(stderr))
+
+    def _encode_ffmpeg(self, wav_bytes: bytes) -> bytes:
+        command = self._ffmpeg_command(["-f", "wav"])
+        try:
+            # communicate() lit stdout/stderr en parallèle de l'écriture: pas de deadlock
+            done = subprocess.run(
+                command, input=wav_bytes, capture_output=True, timeout=self.timeout_s
+            )
+        except FileNotFoundError as e:
+            raise AudioEncodeError(
+                f"ffmpeg not found ({self.ffmpeg!r}); install it or lameenc"
+            ) from e
+        except subprocess.TimeoutExpired as e:
+            raise AudioEncodeError(f"ffmpeg timed out after {self.timeout_s}s") from e
+
+        self._check(done.returncode, bool(done.stdout), done.stderr)
+        return done.stdout
+
+    def _ffmpeg_command(self, input_args: list[str]) -> list[str]:
+        return [
+            self.ffmpeg, "-hide_banner", "-nostdin", "-loglevel", "error",
+            *input_args, "-i", "pipe:0",
+            "-codec:a", "libmp3lame", "-q:a", str(self.quality),
+            "-f", "mp3", "pipe:1",
+        ]
+
+    def _spawn(self, command: list[str]) -> subprocess.Popen:
+        try:
+            return subprocess.Popen(
+                command, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE
+            )
+        except FileNotFoundError as e:
+            raise AudioEncodeError(
+                f"ffmpeg not found ({self.ffmpeg!r}); install it or lameenc"
+            ) from e
+
+    def _check(self, returncode: int, has_output: bool, stderr_bytes: bytes) -> None:
+        if returncode == 0 and has_output:
+            return
+        stderr = stderr_bytes.decode("utf-8", "replace").strip()
+        raise AudioEncodeError(
+            f"ffmpeg failed (exit {returncode}): {stderr[-2000:] or 'no output'}",
+            returncode=returncode,
+            stderr=stderr,
+        )
+
+
+class Mp3EncoderPool:
+    """
+    Pool d'encodage partagé pour les gros volumes: `workers` encodages en parallèle
+    (ffmpeg: un processus par clip en vol; lameenc: encodage dans les threads du pool).
+    Les threads restent vivants entre les clips; utilisable comme encodeur de TtsApi.
+
+        with Mp3EncoderPool(workers=8) as pool:
+            tts = TtsApi(encoder=pool)
+    """
+
+    def __init__(self, workers: int = 4, encoder: Mp3Encoder | None = None) -> None:
+        self.encoder = encoder or Mp3Encoder()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="mp3-encoder"
+        )
+
+    def submit(self, wav_bytes: bytes) -> Future[bytes]:
+        return self._pool.submit(self.encoder.encode, wav_bytes)
+
+    def encode(self, wav_bytes: bytes) -> bytes:
+        return self.submit(wav_bytes).result()
+
+    async def aencode(self, wav_bytes: bytes) -> bytes:
+        return await asyncio.wrap_future(self.submit(wav_bytes))
+
+    def encode_stream(self, pcm_chunks: Iterable[bytes], **format) -> Iterator[bytes]:
+        """Flux: encodé dans le thread appelant (le débit suit la génération)."""
+        return self.encoder.encode_stream(pcm_chunks, **format)
+
+    def map(self, wavs: Iterable[bytes]) -> Iterator[bytes]:
+        """Encode en parallèle, résultats dans l'ordre d'entrée."""
+        return self._pool.map(self.encoder.encode, wavs)
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=True)
+
+    def __enter__(self) -> "Mp3EncoderPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
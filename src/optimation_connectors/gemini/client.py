@@ -3,14 +3,31 @@ import os
 from google import genai
 from google.genai import Client as GenaiClient
 
-from .tts import TtsApi
+from optimation_core import AudioCache
+from optimation_core.rate_limit import RateLimiter
+from optimation_core.retry import RetryPolicy
+
+from .tts import AsyncTtsApi, TtsApi
 
 
 class GeminiClient:
-    def __init__(self, client: GenaiClient | None = None, api_key: str | None = None):
+    def __init__(
+        self,
+        client: GenaiClient | None = None,
+        api_key: str | None = None,
+        retry: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        cache: AudioCache | None = None,
+    ):
         if api_key:
-            self._client = genai.Client(api_key)
+            self._client = genai.Client(api_key=api_key)
         else:    
             self._client = client or genai.Client(api_key=os.environ.get("GEMINI_API_KEY"))
 
-        self.tts = TtsApi(client=self._client)
+        self.tts = TtsApi(
+            client=self._client, retry=retry, rate_limiter=rate_limiter, cache=cache
+        )
+        # Variante asyncio: même client (client.aio), mêmes retry/quota/cache
+        self.atts = AsyncTtsApi(
+            client=self._client, retry=retry, rate_limiter=rate_limiter, cache=cache
+        )
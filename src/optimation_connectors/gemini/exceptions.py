@@ -9,3 +9,12 @@ class ResourceExhausted(ConnectorError):
     status_code: int
     message: str
     details: Optional[Mapping[str, Any]] = None
+
+
+class AudioEncodeError(ConnectorError):
+    """Échec de l'encodage audio (ffmpeg / lameenc); stderr de ffmpeg conservé."""
+
+    def __init__(self, message: str, *, returncode: Optional[int] = None, stderr: str = "") -> None:
+        super().__init__(message)
+        self.returncode = returncode
+        self.stderr = stderr
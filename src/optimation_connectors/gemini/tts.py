@@ -1,17 +1,25 @@
 from __future__ import annotations
 
-from typing import Literal
+from typing import Iterable, Iterator, Literal, Optional
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import io
+import itertools
 import os
+import re
 import mimetypes
 import struct
-import subprocess
-import tempfile
+import wave
 
 from google.genai import types
 from google.genai import Client as GenaiClient
 from google.genai import errors
 
+from optimation_core import AudioCache, get_logger
+from optimation_core.rate_limit import RateLimiter, estimate_tokens
+from optimation_core.retry import RetryPolicy
 
+from .audio import Mp3Encoder, Mp3EncoderPool
 from .exceptions import ResourceExhausted, ConnectorError
 
 VoiceName = Literal["Zephyr", "Puck"]
@@ -22,19 +30,41 @@ ModelName = Literal[
     "gemini-2.5-flash-native-audio-preview-12-2025",
 ]
 OutFormat = Literal["wav", "mp3"]
+StreamFormat = Literal["pcm", "wav", "mp3"]
 
+# Taille max d'un segment en mode long (caractères): bien sous la limite d'entrée TTS
+SEGMENT_MAX_CHARS = 3000
 
-class TtsApi:
-    def __init__(self, client: GenaiClient | None = None):
-        self._client = client or GenaiClient(api_key=os.environ.get("GEMINI_API_KEY"))
+_SENTENCE_END = re.compile(r"(?<=[.!?…;:])\s+")
 
-    def generate(
+
+class _BaseTtsApi:
+    def __init__(
         self,
-        model: ModelName = "gemini-2.5-pro-preview-tts",
-        system_prompt: str = "",
-        prompt: str = "",
-        voice_name: VoiceName = "Zephyr",
-    ) -> types.GenerateContentResponse:
+        client: GenaiClient | None = None,
+        retry: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        encoder: Mp3Encoder | Mp3EncoderPool | None = None,
+        cache: AudioCache | None = None,
+    ):
+        self._client = client or GenaiClient(api_key=os.environ.get("GEMINI_API_KEY"))
+        # Optionnel: retry des ResourceExhausted (429/503) avec la politique partagée
+        self._retry = retry
+        # Optionnel: quota requêtes/tokens partagé (consulté à chaque tentative)
+        self._rate_limiter = rate_limiter
+        # Encodage MP3: lameenc en process si installé, sinon ffmpeg en pipes.
+        # Passer un Mp3EncoderPool pour partager les workers entre plusieurs TtsApi.
+        self._encoder = encoder or Mp3Encoder()
+        # Optionnel: cache d'audio partagé (disque), consulté avant tout appel API
+        self._cache = cache
+        self.log = get_logger("optimation.connectors.gemini")
+
+    def _build_request(
+        self,
+        system_prompt: str,
+        prompt: str,
+        voice_name: VoiceName,
+    ) -> tuple[list[types.Content], types.GenerateContentConfig]:
         contents = [
             types.Content(
                 role="user",
@@ -51,40 +81,101 @@ class TtsApi:
                 )
             ),
         )
+        return contents, generate_content_config
+
+    def _cache_key(
+        self,
+        model: str,
+        system_prompt: str,
+        prompt: str,
+        voice_name: str,
+        out_format: str,
+    ) -> Optional[str]:
+        if self._cache is None:
+            return None
+        return AudioCache.key(
+            provider="gemini",
+            model=model,
+            voice=voice_name,
+            language=None,
+            system_prompt=system_prompt,
+            text=prompt,
+            format=out_format,
+        )
+
+    def _extract_inline_audio(self, generation: types.GenerateContentResponse) -> types.Blob:
+        blobs = list(_audio_blobs(generation))
+        if not blobs:
+            raise RuntimeError("No audio part found in generation response.")
+        if len(blobs) == 1:
+            return blobs[0]
+        # Réponse en plusieurs parts audio: concaténées dans l'ordre
+        pcm = [_as_pcm(blob.data, blob.mime_type or "") for blob in blobs]
+        return types.Blob(data=b"".join(data for data, _ in pcm), mime_type=pcm[0][1])
+
+    def _ensure_wav(self, audio_data: bytes, mime_type: str) -> bytes:
+        # If API returned a real audio container with known extension, we still
+        # normalize to WAV for consistency when out_format="wav" or before mp3 encoding.
+        # If it's PCM raw (audio/L16;rate=24000), we must add WAV header.
+        mt = (mime_type or "").lower()
+
+        # Raw PCM is usually "audio/L16;rate=24000"
+        if "audio/l" in mt:
+            return self._pcm_to_wav(audio_data, mime_type)
+
+        # If it's already wav-ish, just return
+        ext = mimetypes.guess_extension(mime_type or "")
+        if ext == ".wav":
+            return audio_data
+
+        # Otherwise, we *could* attempt to decode other containers to wav,
+        # but in practice Gemini TTS here is usually PCM. We'll be strict:
+        # treat unknown as PCM and wrap (safe fallback).
+        return self._pcm_to_wav(audio_data, mime_type)
+
+    def _pcm_to_wav(self, audio_data: bytes, mime_type: str) -> bytes:
+        sample_rate, bits_per_sample = _pcm_params(mime_type)
+        return _wav_header(sample_rate, bits_per_sample, len(audio_data)) + audio_data
+
+
+class TtsApi(_BaseTtsApi):
+    def generate(
+        self,
+        model: ModelName = "gemini-2.5-pro-preview-tts",
+        system_prompt: str = "",
+        prompt: str = "",
+        voice_name: VoiceName = "Zephyr",
+    ) -> types.GenerateContentResponse:
+        contents, generate_content_config = self._build_request(system_prompt, prompt, voice_name)
+        tokens = estimate_tokens(system_prompt, prompt)
+        if self._retry is None:
+            return self._generate_once(model, contents, generate_content_config, tokens)
+
+        return self._retry.call(
+            lambda: self._generate_once(model, contents, generate_content_config, tokens),
+            retry_if=lambda e: isinstance(e, ResourceExhausted),
+            retry_after=_resource_exhausted_retry_after,
+            label=f"gemini {model}",
+        )
+
+    def _generate_once(
+        self,
+        model: str,
+        contents: list[types.Content],
+        config: types.GenerateContentConfig,
+        tokens: int = 0,
+    ) -> types.GenerateContentResponse:
+        if self._rate_limiter is not None:
+            self._rate_limiter.acquire(tokens=tokens)
+
         try:
             return self._client.models.generate_content(
                 model=model,
                 contents=contents,
-                config=generate_content_config,
+                config=config,
             )
         except errors.APIError as e:
-            raw_code = getattr(e, "code", None)
-
-            try:
-                code = int(raw_code) if raw_code is not None else None
-            except (TypeError, ValueError):
-                code = None
-
-            details = str(e)  # garde le message original
-
-            # Ressources / quota / capacité
-            if code in (429, 503):
-                raise ResourceExhausted(
-                    status_code=code,
-                    message=(
-                        "Resource exhausted (quota/rate limit/capacity). "
-                        "Check limits: https://aistudio.google.com/rate-limit "
-                        f"| Details: {details}"
-                    ),
-                ) from e
-
-            # Optionnel: considérer 500 comme transient aussi (si tu veux retry)
-            # if code == 500:
-            #     raise ResourceExhausted(status_code=code, message=f"Transient server error | {details}") from e
-
-            raise ConnectorError(
-                f"GenAI API error (code={code}) | {details}"
-            ) from e
+            raise _map_api_error(e) from e
 
     # ----------------------------
     # Public helper: returns bytes ready to save
@@ -101,8 +192,13 @@ class TtsApi:
         """
         Returns (audio_bytes, mime_type_of_returned_bytes).
         - out_format="wav": always returns a valid WAV container (PCM).
-        - out_format="mp3": returns MP3 bytes (requires ffmpeg installed).
+        - out_format="mp3": returns MP3 bytes (requires lameenc or ffmpeg).
+        Avec un cache, une requête identique est servie depuis le disque.
         """
+        cache_key = self._cache_key(model, system_prompt, prompt, voice_name, out_format)
+        if cache_key is not None and (cached := self._cache.get(cache_key)) is not None:
+            return cached
+
         generation = self.generate(
             model=model,
             system_prompt=system_prompt,
@@ -117,107 +213,446 @@ class TtsApi:
         # Ensure we have a real WAV first (wrap PCM if needed)
         wav_bytes = self._ensure_wav(audio_bytes, mime_type)
 
+        if out_format == "wav":
+            result = wav_bytes, "audio/wav"
+        else:
+            # out_format == "mp3"
+            result = self._wav_bytes_to_mp3(wav_bytes), "audio/mpeg"
+
+        if cache_key is not None:
+            self._cache.set(cache_key, *result)
+        return result
+
+    def synthesize_long(
+        self,
+        text: str,
+        *,
+        system_prompt: str = "",
+        model: ModelName = "gemini-2.5-pro-preview-tts",
+        voice_name: VoiceName = "Zephyr",
+        out_format: OutFormat = "wav",
+        max_chars: int = SEGMENT_MAX_CHARS,
+        concurrency: int = 4,
+        segment_retry: RetryPolicy | None = None,
+    ) -> tuple[bytes, str]:
+        """
+        Mode long (scripts de plusieurs minutes): texte découpé aux paragraphes/phrases
+        (split_text, <= max_chars), segments synthétisés en parallèle (`concurrency`),
+        chacun retenté seul (segment_retry, sinon self._retry, sinon 3 tentatives).
+        Le PCM des segments est concaténé tel quel: un seul en-tête WAV, pas de décodage.
+        """
+        segments = split_text(text, max_chars)
+        if not segments:
+            raise ValueError("Nothing to synthesize: text is empty.")
+        policy = segment_retry or self._retry or RetryPolicy(max_attempts=3)
+
+        def run(index: int) -> tuple[bytes, str]:
+            return policy.call(
+                lambda: self._segment_pcm(model, system_prompt, segments[index], voice_name),
+                # RuntimeError: réponse sans audio, se produit de façon transitoire
+                retry_if=lambda e: isinstance(e, (ResourceExhausted, RuntimeError)),
+                retry_after=_resource_exhausted_retry_after,
+                label=f"gemini {model} segment {index + 1}/{len(segments)}",
+                log=self.log,
+            )
+
+        pool = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(segments))))
+        try:
+            results = list(pool.map(run, range(len(segments))))
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+        mime_type = results[0][1]
+        for _, other in results[1:]:
+            if _pcm_format(other) != _pcm_format(mime_type):
+                raise ConnectorError(
+                    f"Segments returned different audio formats: {mime_type!r} vs {other!r}"
+                )
+        wav_bytes = self._pcm_to_wav(b"".join(pcm for pcm, _ in results), mime_type)
+
         if out_format == "wav":
             return wav_bytes, "audio/wav"
+        return self._wav_bytes_to_mp3(wav_bytes), "audio/mpeg"
+
+    def stream_pcm(
+        self,
+        prompt: str,
+        *,
+        system_prompt: str = "",
+        model: ModelName = "gemini-2.5-pro-preview-tts",
+        voice_name: VoiceName = "Zephyr",
+    ) -> Iterator[tuple[bytes, str]]:
+        """
+        Audio au fil de la génération (generate_content_stream): (chunk PCM, mime)
+        dès réception, toutes les parts audio de chaque réponse dans l'ordre.
+        self._retry ne couvre que l'ouverture du flux (avant le premier octet rendu).
+        """
+        contents, config = self._build_request(system_prompt, prompt, voice_name)
+        tokens = estimate_tokens(system_prompt, prompt)
+
+        def open_stream() -> tuple[Optional[types.GenerateContentResponse], Iterator]:
+            if self._rate_limiter is not None:
+                self._rate_limiter.acquire(tokens=tokens)
+            try:
+                responses = self._client.models.generate_content_stream(
+                    model=model,
+                    contents=contents,
+                    config=config,
+                )
+                # la requête part au premier next()
+                return next(responses, None), responses
+            except errors.APIError as e:
+                raise _map_api_error(e) from e
+
+        if self._retry is None:
+            response, responses = open_stream()
+        else:
+            response, responses = self._retry.call(
+                open_stream,
+                retry_if=lambda e: isinstance(e, ResourceExhausted),
+                retry_after=_resource_exhausted_retry_after,
+                label=f"gemini {model} stream",
+                log=self.log,
+            )
+
+        found = False
+        try:
+            while response is not None:
+                for blob in _audio_blobs(response):
+                    found = True
+                    yield _as_pcm(blob.data, blob.mime_type or "")
+                response = next(responses, None)
+        except errors.APIError as e:
+            raise _map_api_error(e) from e
+        if not found:
+            raise RuntimeError("No audio part found in streamed response.")
 
-        # out_format == "mp3"
-        mp3_bytes = self._wav_bytes_to_mp3(wav_bytes)
-        return mp3_bytes, "audio/mpeg"
+    def stream(
+        self,
+        prompt: str,
+        *,
+        system_prompt: str = "",
+        model: ModelName = "gemini-2.5-pro-preview-tts",
+        voice_name: VoiceName = "Zephyr",
+        out_format: StreamFormat = "wav",
+    ) -> Iterator[bytes]:
+        """
+        Octets prêts à envoyer/écrire au fil de la génération:
+        - "pcm": PCM brut (16 bits mono, débit dans le mime de stream_pcm)
+        - "wav": en-tête WAV "streaming" (tailles inconnues, 0xFFFFFFFF) puis le PCM
+        - "mp3": trames MP3 de l'encodeur incrémental (self._encoder)
+        """
+        chunks = self.stream_pcm(
+            prompt, system_prompt=system_prompt, model=model, voice_name=voice_name
+        )
+        if out_format == "pcm":
+            for pcm, _ in chunks:
+                yield pcm
+            return
+
+        pcm, mime_type = next(chunks)
+        sample_rate, bits_per_sample = _pcm_params(mime_type)
+        rest = (chunk for chunk, _ in chunks)
+        if out_format == "wav":
+            yield _wav_header(sample_rate, bits_per_sample, None)
+            yield pcm
+            yield from rest
+            return
+
+        yield from self._encoder.encode_stream(
+            itertools.chain([pcm], rest),
+            sample_rate=sample_rate,
+            sample_width=bits_per_sample // 8,
+        )
 
     # ----------------------------
     # Internals
     # ----------------------------
-    def _extract_inline_audio(self, generation: types.GenerateContentResponse) -> types.Blob:
+    def _segment_pcm(
+        self,
+        model: str,
+        system_prompt: str,
+        prompt: str,
+        voice_name: VoiceName,
+    ) -> tuple[bytes, str]:
+        """Un segment -> (PCM brut, mime "audio/L16;rate=..."). Sans retry: voir l'appelant."""
+        contents, config = self._build_request(system_prompt, prompt, voice_name)
+        tokens = estimate_tokens(system_prompt, prompt)
+        inline = self._extract_inline_audio(
+            self._generate_once(model, contents, config, tokens)
+        )
+        return _as_pcm(inline.data, inline.mime_type or "")
+
+    def _wav_bytes_to_mp3(self, wav_bytes: bytes) -> bytes:
+        # Pipes / en process: aucun fichier temporaire; échec -> AudioEncodeError
+        return self._encoder.encode(wav_bytes)
+
+
+class AsyncTtsApi(_BaseTtsApi):
+    """
+    Variante asyncio (client.aio de google-genai): mêmes erreurs (ResourceExhausted,
+    ConnectorError), même retry, quota, cache et encodeur. L'encodage MP3 ne bloque
+    pas la boucle (sous-processus asyncio ou thread).
+    """
+
+    async def generate(
+        self,
+        model: ModelName = "gemini-2.5-pro-preview-tts",
+        system_prompt: str = "",
+        prompt: str = "",
+        voice_name: VoiceName = "Zephyr",
+    ) -> types.GenerateContentResponse:
+        contents, generate_content_config = self._build_request(system_prompt, prompt, voice_name)
+        tokens = estimate_tokens(system_prompt, prompt)
+        if self._retry is None:
+            return await self._generate_once(model, contents, generate_content_config, tokens)
+
+        return await self._retry.acall(
+            lambda: self._generate_once(model, contents, generate_content_config, tokens),
+            retry_if=lambda e: isinstance(e, ResourceExhausted),
+            retry_after=_resource_exhausted_retry_after,
+            label=f"gemini {model}",
+        )
+
+    async def _generate_once(
+        self,
+        model: str,
+        contents: list[types.Content],
+        config: types.GenerateContentConfig,
+        tokens: int = 0,
+    ) -> types.GenerateContentResponse:
+        if self._rate_limiter is not None:
+            await self._rate_limiter.aacquire(tokens=tokens)
+
         try:
-            part = generation.candidates[0].content.parts[0]
-            inline = part.inline_data
-        except Exception as e:
-            raise RuntimeError("No audio part found in generation response.") from e
+            return await self._client.aio.models.generate_content(
+                model=model,
+                contents=contents,
+                config=config,
+            )
+        except errors.APIError as e:
+            raise _map_api_error(e) from e
 
-        if not inline or not inline.data:
-            raise RuntimeError("Audio inline_data is empty.")
-        return inline
+    async def synthesize(
+        self,
+        prompt: str,
+        *,
+        system_prompt: str = "",
+        model: ModelName = "gemini-2.5-pro-preview-tts",
+        voice_name: VoiceName = "Zephyr",
+        out_format: OutFormat = "wav",
+    ) -> tuple[bytes, str]:
+        """Comme TtsApi.synthesize: (audio, type MIME)."""
+        cache_key = self._cache_key(model, system_prompt, prompt, voice_name, out_format)
+        # Lecture / écriture du cache (SQLite + fichiers) hors de la boucle
+        if cache_key is not None and (
+            cached := await asyncio.to_thread(self._cache.get, cache_key)
+        ) is not None:
+            return cached
+
+        generation = await self.generate(
+            model=model,
+            system_prompt=system_prompt,
+            prompt=prompt,
+            voice_name=voice_name,
+        )
+        inline = self._extract_inline_audio(generation)
+        wav_bytes = self._ensure_wav(inline.data, inline.mime_type or "")
 
-    def _ensure_wav(self, audio_data: bytes, mime_type: str) -> bytes:
-        # If API returned a real audio container with known extension, we still
-        # normalize to WAV for consistency when out_format="wav" or before mp3 encoding.
-        # If it's PCM raw (audio/L16;rate=24000), we must add WAV header.
-        mt = (mime_type or "").lower()
+        if out_format == "wav":
+            result = wav_bytes, "audio/wav"
+        else:
+            result = await self._encoder.aencode(wav_bytes), "audio/mpeg"
 
-        # Raw PCM is usually "audio/L16;rate=24000"
-        if "audio/l" in mt:
-            return self._pcm_to_wav(audio_data, mime_type)
+        if cache_key is not None:
+            await asyncio.to_thread(self._cache.set, cache_key, *result)
+        return result
 
-        # If it's already wav-ish, just return
-        ext = mimetypes.guess_extension(mime_type or "")
-        if ext == ".wav":
-            return audio_data
+    async def synthesize_many(
+        self,
+        prompts: Iterable[str],
+        *,
+        concurrency: int = 4,
+        return_exceptions: bool = False,
+        **options,
+    ) -> list[tuple[bytes, str] | BaseException]:
+        """
+        Plusieurs synthèses via asyncio.gather (ordre d'entrée), au plus `concurrency`
+        en vol. return_exceptions=True: une erreur prend la place de son résultat.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
 
-        # Otherwise, we *could* attempt to decode other containers to wav,
-        # but in practice Gemini TTS here is usually PCM. We'll be strict:
-        # treat unknown as PCM and wrap (safe fallback).
-        return self._pcm_to_wav(audio_data, mime_type)
+        async def run(prompt: str) -> tuple[bytes, str]:
+            async with semaphore:
+                return await self.synthesize(prompt, **options)
 
-    def _pcm_to_wav(self, audio_data: bytes, mime_type: str) -> bytes:
-        # Defaults
-        bits_per_sample = 16
-        sample_rate = 24000
-
-        # Parse "audio/L16;rate=24000"
-        parts = [p.strip() for p in (mime_type or "").split(";") if p.strip()]
-        for p in parts:
-            pl = p.lower()
-            if pl.startswith("rate="):
-                try:
-                    sample_rate = int(p.split("=", 1)[1])
-                except ValueError:
-                    pass
-            elif pl.startswith("audio/l"):
-                try:
-                    bits_per_sample = int(pl.split("audio/l", 1)[1])
-                except ValueError:
-                    pass
-
-        num_channels = 1
-        bytes_per_sample = bits_per_sample // 8
-        block_align = num_channels * bytes_per_sample
-        byte_rate = sample_rate * block_align
-        data_size = len(audio_data)
+        return await asyncio.gather(
+            *(run(prompt) for prompt in prompts), return_exceptions=return_exceptions
+        )
+
+
+def _pcm_params(mime_type: str) -> tuple[int, int]:
+    # Defaults
+    bits_per_sample = 16
+    sample_rate = 24000
+
+    # Parse "audio/L16;rate=24000"
+    parts = [p.strip() for p in (mime_type or "").split(";") if p.strip()]
+    for p in parts:
+        pl = p.lower()
+        if pl.startswith("rate="):
+            try:
+                sample_rate = int(p.split("=", 1)[1])
+            except ValueError:
+                pass
+        elif pl.startswith("audio/l"):
+            try:
+                bits_per_sample = int(pl.split("audio/l", 1)[1])
+            except ValueError:
+                pass
+    return sample_rate, bits_per_sample
+
+
+def _wav_header(sample_rate: int, bits_per_sample: int, data_size: Optional[int]) -> bytes:
+    # data_size=None: flux dont la longueur est inconnue -> tailles au maximum (0xFFFFFFFF),
+    # convention acceptée par les lecteurs/navigateurs pour un WAV en streaming
+    num_channels = 1
+    bytes_per_sample = bits_per_sample // 8
+    block_align = num_channels * bytes_per_sample
+    byte_rate = sample_rate * block_align
+    if data_size is None:
+        chunk_size = data_size = 0xFFFFFFFF
+    else:
         chunk_size = 36 + data_size
 
-        header = struct.pack(
-            "<4sI4s4sIHHIIHH4sI",
-            b"RIFF",
-            chunk_size,
-            b"WAVE",
-            b"fmt ",
-            16,
-            1,  # PCM
-            num_channels,
-            sample_rate,
-            byte_rate,
-            block_align,
-            bits_per_sample,
-            b"data",
-            data_size,
+    return struct.pack(
+        "<4sI4s4sIHHIIHH4sI",
+        b"RIFF",
+        chunk_size,
+        b"WAVE",
+        b"fmt ",
+        16,
+        1,  # PCM
+        num_channels,
+        sample_rate,
+        byte_rate,
+        block_align,
+        bits_per_sample,
+        b"data",
+        data_size,
+    )
+
+
+def _audio_blobs(response: types.GenerateContentResponse) -> Iterator[types.Blob]:
+    """Toutes les parts audio non vides du premier candidat, dans l'ordre."""
+    candidates = response.candidates or []
+    content = candidates[0].content if candidates else None
+    for part in (content.parts or []) if content is not None else []:
+        if part.inline_data is not None and part.inline_data.data:
+            yield part.inline_data
+
+
+def split_text(text: str, max_chars: int = SEGMENT_MAX_CHARS) -> list[str]:
+    """
+    Découpe un long texte en segments <= max_chars, aux limites de paragraphes,
+    puis de phrases, puis de mots (coupe franche en dernier recours).
+    Les paragraphes/phrases courts sont regroupés jusqu'à la limite.
+    """
+    max_chars = max(1, max_chars)
+    pieces: list[str] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            pieces.append(paragraph)
+            continue
+        for sentence in _SENTENCE_END.split(paragraph):
+            if len(sentence) <= max_chars:
+                pieces.append(sentence)
+                continue
+            for word in sentence.split(" "):
+                pieces.extend(word[i:i + max_chars] for i in range(0, len(word), max_chars))
+
+    segments: list[str] = []
+    current = ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_chars:
+            segments.append(current)
+            current = ""
+        current = f"{current} {piece}" if current else piece
+    if current:
+        segments.append(current)
+    return segments
+
+
+def _as_pcm(audio_data: bytes, mime_type: str) -> tuple[bytes, str]:
+    # Segment déjà en WAV: on retire l'en-tête pour concaténer les échantillons
+    if mimetypes.guess_extension(mime_type or "") == ".wav":
+        try:
+            with wave.open(io.BytesIO(audio_data)) as w:
+                mime_type = f"audio/L{8 * w.getsampwidth()};rate={w.getframerate()}"
+                return w.readframes(w.getnframes()), mime_type
+        except (wave.Error, EOFError):
+            pass
+    return audio_data, mime_type
+
+
+def _pcm_format(mime_type: str) -> str:
+    return "".join((mime_type or "").lower().split())
+
+
+# ----------------------------
+# Error mapping
+# ----------------------------
+def _map_api_error(e: errors.APIError) -> ConnectorError:
+    raw_code = getattr(e, "code", None)
+
+    try:
+        code = int(raw_code) if raw_code is not None else None
+    except (TypeError, ValueError):
+        code = None
+
+    details = str(e)  # garde le message original
+
+    # Ressources / quota / capacité
+    if code in (429, 503):
+        retry_delay = _retry_delay_s(e)
+        return ResourceExhausted(
+            status_code=code,
+            message=(
+                "Resource exhausted (quota/rate limit/capacity). "
+                "Check limits: https://aistudio.google.com/rate-limit "
+                f"| Details: {details}"
+            ),
+            details={"retry_after": retry_delay} if retry_delay is not None else None,
         )
-        return header + audio_data
 
-    def _wav_bytes_to_mp3(self, wav_bytes: bytes) -> bytes:
-        # Requires ffmpeg in PATH
-        with tempfile.TemporaryDirectory() as td:
-            wav_path = os.path.join(td, "in.wav")
-            mp3_path = os.path.join(td, "out.mp3")
-
-            with open(wav_path, "wb") as f:
-                f.write(wav_bytes)
-
-            subprocess.run(
-                ["ffmpeg", "-y", "-i", wav_path, "-codec:a", "libmp3lame", "-q:a", "3", mp3_path],
-                check=True,
-                stdout=subprocess.DEVNULL,
-                stderr=subprocess.DEVNULL,
-            )
+    # Optionnel: considérer 500 comme transient aussi (si tu veux retry)
+    # if code == 500:
+    #     return ResourceExhausted(status_code=code, message=f"Transient server error | {details}")
+
+    return ConnectorError(
+        f"GenAI API error (code={code}) | {details}"
+    )
+
+
+def _retry_delay_s(e: errors.APIError) -> float | None:
+    # google.rpc.RetryInfo: {"@type": ".../google.rpc.RetryInfo", "retryDelay": "13s"}
+    payload = getattr(e, "details", None)
+    if not isinstance(payload, dict):
+        return None
+    error = payload.get("error", payload)
+    for item in (error.get("details") or []) if isinstance(error, dict) else []:
+        if isinstance(item, dict) and str(item.get("@type", "")).endswith("RetryInfo"):
+            try:
+                return float(str(item.get("retryDelay", "")).rstrip("s"))
+            except ValueError:
+                return None
+    return None
+
 
-            with open(mp3_path, "rb") as f:
-                return f.read()
\ No newline at end of file
+def _resource_exhausted_retry_after(error: BaseException) -> float | None:
+    if isinstance(error, ResourceExhausted) and error.details:
+        return error.details.get("retry_after")
+    return None
@@ -1,4 +1,10 @@
 from .client import OpenAiClient
 from .exceptions import OcrInputError, OcrBadMimeTypeError
+from .batch import OcrBatchApi, OcrBatchResult
+from .file_index import FileIndex
+from .files import BulkReport, FileOpResult, UploadProgress
+from .ocr import AsyncOcrApi, OcrResult, OcrStreamEvent
 
-__all__ = ['OpenAiClient', 'OcrInputError', 'OcrBadMimeTypeError']
\ No newline at end of file
+__all__ = ['OpenAiClient', 'AsyncOcrApi', 'OcrResult', 'OcrStreamEvent', 'OcrBatchApi',
+           'OcrBatchResult', 'FileIndex', 'BulkReport', 'FileOpResult', 'UploadProgress',
+           'OcrInputError', 'OcrBadMimeTypeError']
@@ -0,0 +1,234 @@
+import json
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, Mapping, Optional
+
+from openai import APIStatusError, OpenAI
+from openai.types import Batch
+from pydantic import TypeAdapter, ValidationError
+
+from optimation_core.exceptions import ApiError, ConnectorError
+from optimation_core.logging import get_logger
+
+from .files import FilesApi
+from .exceptions import _map_api_error
+from .ocr import _BaseOcrApi
+
+BATCH_ENDPOINT = "/v1/responses"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+@dataclass
+class OcrBatchResult:
+    """Sortie d'une ligne du batch (value ou error, jamais les deux)."""
+    custom_id: str
+    value: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class OcrBatchApi(_BaseOcrApi):
+    """
+    OCR via l'API Batch OpenAI (moitié prix, hors quota temps réel, résultat sous 24h).
+    Mêmes corps de requête que `OcrApi.extract_data`, sérialisés en JSONL:
+
+        batch = ocr_batch.submit({"inv-1": {"url": ...}, "inv-2": {"file_id": ...}}, schema=Invoice)
+        batch = ocr_batch.wait(batch.id)
+        for result in ocr_batch.iter_results(batch, schema=Invoice):
+            ...
+    """
+
+    def __init__(
+        self,
+        client: OpenAI = None,
+        files: FilesApi | None = None,
+        document_tokens: int = 1500,
+    ):
+        super().__init__(document_tokens=document_tokens)
+        self.client = client or OpenAI()
+        self.files = files or FilesApi(client=self.client)
+        self.log = get_logger("optimation.connectors.openai")
+
+    def build_requests(
+        self,
+        documents: Mapping[str, Mapping[str, Any]] | Iterable[Mapping[str, Any]],
+        **options: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Une ligne JSONL par document: {"custom_id", "method", "url", "body"}.
+        documents: {custom_id: kwargs de extract_data} ou itérable (custom_id = "doc-<i>").
+        """
+        items = documents.items() if isinstance(documents, Mapping) else (
+            (f"doc-{i}", document) for i, document in enumerate(documents)
+        )
+        for custom_id, document in items:
+            kwargs, _ = self._request({**options, **document})
+            body: dict[str, Any] = {"model": kwargs["model"], "input": kwargs["input"]}
+            if "text_format" in kwargs:
+                body["text"] = {"format": _text_format(kwargs["text_format"])}
+            yield {"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body}
+
+    def submit(
+        self,
+        documents: Mapping[str, Mapping[str, Any]] | Iterable[Mapping[str, Any]],
+        *,
+        metadata: dict[str, str] | None = None,
+        **options: Any,
+    ) -> Batch:
+        lines = [
+            json.dumps(request, ensure_ascii=False, separators=(",", ":"))
+            for request in self.build_requests(documents, **options)
+        ]
+        if not lines:
+            raise ConnectorError("Empty OCR batch")
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+
+        input_file = self.files.upload_bytes(data, "ocr_batch.jsonl", purpose="batch")
+        try:
+            batch = self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint=BATCH_ENDPOINT,
+                completion_window="24h",
+                **({"metadata": metadata} if metadata else {}),
+            )
+        except APIStatusError as e:
+            raise _map_api_error(e) from e
+        self.log.info("OCR batch %s submitted (%d requests)", batch.id, len(lines))
+        return batch
+
+    def wait(
+        self,
+        batch_id: str,
+        *,
+        poll_s: float = 5.0,
+        max_poll_s: float = 60.0,
+        timeout_s: float | None = None,
+    ) -> Batch:
+        """
+        Attend un statut terminal (completed/failed/expired/cancelled).
+        Intervalle de poll doublé à chaque tour jusqu'à max_poll_s: un batch dure
+        des minutes à des heures, inutile de marteler l'API.
+        """
+        deadline = time.monotonic() + timeout_s if timeout_s is not None else None
+        delay = poll_s
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            if batch.status in TERMINAL_STATUSES:
+                return batch
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise ConnectorError(
+                        f"OCR batch {batch_id} still {batch.status} after {timeout_s}s"
+                    )
+                delay = min(delay, remaining)
+            self.log.debug("OCR batch %s %s, next poll in %.0fs", batch_id, batch.status, delay)
+            time.sleep(delay)
+            delay = min(delay * 2, max_poll_s)
+
+    def iter_results(self, batch: Batch | str, schema: Any = None) -> Iterator[OcrBatchResult]:
+        """
+        Lit les fichiers de sortie et d'erreurs en flux (ligne par ligne).
+        schema: chaque sortie texte est validée en objet (modèle pydantic ou type).
+        """
+        if isinstance(batch, str):
+            batch = self.client.batches.retrieve(batch)
+        if batch.status != "completed" and not (batch.output_file_id or batch.error_file_id):
+            raise ConnectorError(f"OCR batch {batch.id} ended with status {batch.status}")
+
+        adapter = TypeAdapter(schema) if schema is not None else None
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self._iter_lines(file_id):
+                yield _parse_line(json.loads(line), adapter)
+
+    def run(
+        self,
+        documents: Mapping[str, Mapping[str, Any]] | Iterable[Mapping[str, Any]],
+        *,
+        schema: Any = None,
+        poll_s: float = 5.0,
+        max_poll_s: float = 60.0,
+        timeout_s: float | None = None,
+        **options: Any,
+    ) -> Iterator[OcrBatchResult]:
+        """submit + wait + iter_results."""
+        batch = self.submit(documents, schema=schema, **options)
+        batch = self.wait(batch.id, poll_s=poll_s, max_poll_s=max_poll_s, timeout_s=timeout_s)
+        return self.iter_results(batch, schema=schema)
+
+    def _iter_lines(self, file_id: str) -> Iterator[str]:
+        with self.client.files.with_streaming_response.content(file_id) as response:
+            for line in response.iter_lines():
+                if line.strip():
+                    yield line
+
+
+def _text_format(schema: Any) -> dict[str, Any]:
+    """text.format json_schema (strict) de `schema`, comme le construit responses.parse."""
+    name = re.sub(r"[^a-zA-Z0-9_-]", "_", getattr(schema, "__name__", "") or "output")[:64]
+    return {
+        "type": "json_schema",
+        "name": name,
+        "schema": _strict(TypeAdapter(schema).json_schema()),
+        "strict": True,
+    }
+
+
+def _strict(node: Any) -> Any:
+    # Mode strict: chaque objet ferme ses propriétés et les déclare toutes requises
+    if isinstance(node, list):
+        return [_strict(item) for item in node]
+    if not isinstance(node, dict):
+        return node
+    node = {key: _strict(value) for key, value in node.items()}
+    if "default" in node and node["default"] is None:  # refusé en strict, inutile ici
+        del node["default"]
+    if node.get("type") == "object" and "properties" in node:
+        node.setdefault("additionalProperties", False)
+        node["required"] = list(node["properties"])
+    return node
+
+
+def _parse_line(line: dict[str, Any], adapter: Optional[TypeAdapter]) -> OcrBatchResult:
+    custom_id = line.get("custom_id", "")
+    response = line.get("response") or {}
+    status = response.get("status_code", 0)
+    body = response.get("body") or {}
+
+    error = line.get("error") or body.get("error")
+    if error or status != 200:
+        error = error or {}
+        return OcrBatchResult(custom_id, error=ApiError(
+            url='openAI Batch Api',
+            status_code=status,
+            message=error.get("message", "Batch request failed"),
+            details={'code': error.get("code"), 'param': error.get("param")},
+        ))
+
+    text = _output_text(body)
+    if adapter is None:
+        return OcrBatchResult(custom_id, value=text)
+    try:
+        return OcrBatchResult(custom_id, value=adapter.validate_json(text))
+    except ValidationError as e:
+        return OcrBatchResult(custom_id, error=ConnectorError(
+            f"Batch output {custom_id} does not match schema: {e}"
+        ))
+
+
+def _output_text(body: dict[str, Any]) -> str:
+    # équivalent de Response.output_text sur le JSON brut
+    return "".join(
+        part.get("text", "")
+        for item in body.get("output") or []
+        if item.get("type") == "message"
+        for part in item.get("content") or []
+        if part.get("type") == "output_text"
+    )
@@ -1,15 +1,63 @@
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
-from .ocr import OcrApi
+from optimation_core.cache import Cache
+from optimation_core.rate_limit import RateLimiter
+
+from .batch import OcrBatchApi
+from .ocr import AsyncOcrApi, OcrApi
 from .files import FilesApi
 
 
 class OpenAiClient:
-    def __init__(self, client: OpenAI = None, api_key:str = None):
+    def __init__(
+        self,
+        client: OpenAI = None,
+        api_key:str = None,
+        rate_limiter: RateLimiter | None = None,
+        async_client: AsyncOpenAI = None,
+        cache: Cache | None = None,
+    ):
+        """
+        cache: cache des résultats OCR (ex: TieredCache(MemoryCache(), SqliteCache())),
+        partagé par ocr et aocr. None = désactivé.
+        async_client: client de aocr. Sans lui, aocr reprend du client sync la clé,
+        l'endpoint, organization/project, timeout et max_retries seulement: avec un
+        `client` injecté (headers, query, http_client propres), passer aussi async_client.
+        """
         if api_key:
-            self.client = OpenAI(api_key)
+            self.client = OpenAI(api_key=api_key)
         else:    
             self.client = client or OpenAI()
 
-        self.ocr = OcrApi(client = self.client)
-        self.files = FilesApi(client = self.client)
\ No newline at end of file
+        self._api_key = api_key
+        self._async_client = async_client
+        self._rate_limiter = rate_limiter
+        self._cache = cache
+        self._aocr: AsyncOcrApi | None = None
+
+        self.ocr = OcrApi(client = self.client, rate_limiter = rate_limiter, cache = cache)
+        self.files = FilesApi(client = self.client)
+        self.ocr_batch = OcrBatchApi(client = self.client, files = self.files)
+
+    @property
+    def aocr(self) -> AsyncOcrApi:
+        """OCR asyncio (AsyncOpenAI), créé au premier usage, même rate_limiter."""
+        if self._aocr is None:
+            client = self._async_client or _async_client_like(self.client)
+            self._aocr = AsyncOcrApi(
+                client=client, rate_limiter=self._rate_limiter, cache=self._cache
+            )
+        return self._aocr
+
+
+def _async_client_like(client: OpenAI) -> AsyncOpenAI:
+    # Attributs publics du SDK uniquement: même compte / endpoint / timeouts que le
+    # client sync; le reste de sa configuration passe par `async_client`
+    return AsyncOpenAI(
+        api_key=client.api_key,
+        organization=client.organization,
+        project=client.project,
+        base_url=client.base_url,
+        timeout=client.timeout,
+        max_retries=client.max_retries,
+    )
@@ -1,7 +1,53 @@
-from optimation_core import ConnectorError
+from openai import APIStatusError
+
+from optimation_core import ApiError, ConnectorError
+from optimation_core.retry import parse_retry_after
 
 class OcrInputError(ConnectorError):
     ...
 
 class OcrBadMimeTypeError(OcrInputError):
-    ...
\ No newline at end of file
+    ...
+
+
+def _map_api_error(e: APIStatusError) -> ApiError:
+    status = getattr(e, "status_code", 400)
+
+    # Essaye de récupérer le body JSON propre
+    error_data = None
+    if hasattr(e, "response") and e.response is not None:
+        try:
+            error_data = e.response.json()
+        except Exception:
+            pass
+
+    # Fallback sur le message string
+    message = str(e)
+
+    # Extraire infos si possible
+    error_code = None
+    error_type = None
+    error_param = None
+
+    if isinstance(error_data, dict) and isinstance(error_data.get("error"), dict):
+        err = error_data["error"]
+        message = err.get("message", message)
+        error_code = err.get("code")
+        error_type = err.get("type")
+        error_param = err.get("param")
+
+    details = {
+        'code': error_code,
+        'error_type': error_type,
+        'param': error_param}
+
+    if status in (429, 503):
+        headers = e.response.headers if e.response is not None else {}
+        details["retry_after"] = parse_retry_after(headers.get("retry-after"))
+
+    return ApiError(
+        url='openAI Api',
+        status_code=status,
+        message=message,
+        details=details,
+    )
@@ -0,0 +1,74 @@
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional
+
+from optimation_core.cache import default_cache_dir
+from optimation_core.sqlite import SqliteConnections
+
+
+class FileIndex:
+    """
+    Index local (SQLite, partagé entre process) hash de contenu -> file_id OpenAI.
+    Permet d'uploader un document une seule fois puis de le référencer par file_id.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        *,
+        busy_timeout_s: float = 5.0,
+    ) -> None:
+        self.path = Path(path) if path else default_cache_dir() / "openai_files.sqlite3"
+        self.busy_timeout_s = busy_timeout_s
+        self._db = SqliteConnections(self.path, busy_timeout_s=busy_timeout_s)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn().execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            " sha256 TEXT PRIMARY KEY, file_id TEXT NOT NULL, filename TEXT NOT NULL,"
+            " size INTEGER NOT NULL, created REAL NOT NULL, expires REAL)"
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def get(self, sha256: str, *, min_ttl_s: float = 0.0) -> Optional[str]:
+        """file_id encore valide au moins `min_ttl_s` secondes, sinon None."""
+        row = self._conn().execute(
+            "SELECT file_id, expires FROM files WHERE sha256 = ?", (sha256,)
+        ).fetchone()
+        if row is None:
+            return None
+        file_id, expires = row
+        if expires is not None and expires <= time.time() + min_ttl_s:
+            return None
+        return file_id
+
+    def put(
+        self,
+        sha256: str,
+        file_id: str,
+        filename: str,
+        size: int,
+        expires_at: Optional[float] = None,
+    ) -> None:
+        self._conn().execute(
+            "INSERT OR REPLACE INTO files (sha256, file_id, filename, size, created, expires) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (sha256, file_id, filename, size, time.time(), expires_at),
+        )
+
+    def forget(self, sha256: str) -> None:
+        self._conn().execute("DELETE FROM files WHERE sha256 = ?", (sha256,))
+
+    def expired(self, *, min_ttl_s: float = 0.0) -> list[tuple[str, str]]:
+        """(sha256, file_id) expirés ou expirant dans moins de `min_ttl_s` secondes."""
+        return self._conn().execute(
+            "SELECT sha256, file_id FROM files WHERE expires IS NOT NULL AND expires <= ?",
+            (time.time() + min_ttl_s,),
+        ).fetchall()
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM files").fetchone()[0]
@@ -1,45 +1,375 @@
-from typing import Optional
+import mimetypes
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
 
-from openai import OpenAI
+from openai import APIConnectionError, APIError, APIStatusError, OpenAI
 from openai.types import FileObject, FileDeleted
 from openai.pagination import SyncCursorPage
 
+from optimation_core import get_logger
+from optimation_core.retry import RetryPolicy, parse_retry_after
+
+from .exceptions import _map_api_error
+
+T = TypeVar("T")
+
+# Au-delà, upload_file passe par l'API uploads (parts) plutôt que files.create
+CHUNKED_UPLOAD_BYTES = 256 * 1024 * 1024
+# Taille max d'une part côté OpenAI
+MAX_PART_BYTES = 64 * 1024 * 1024
+
+
+@dataclass
+class FileOpResult:
+    """Résultat par élément d'une opération en masse (id de fichier ou chemin)."""
+    item: str
+    file: Optional[FileObject] = None
+    deleted: Optional[FileDeleted] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BulkReport:
+    """
+    Rapport de delete_many / upload_many. dry_run=True: rien n'a été envoyé,
+    `results` liste ce qui l'aurait été.
+    """
+    dry_run: bool
+    results: list[FileOpResult] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def succeeded(self) -> list[FileOpResult]:
+        return [r for r in self.results if r.ok]
+
+    @property
+    def failed(self) -> list[FileOpResult]:
+        return [r for r in self.results if not r.ok]
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(r.file.bytes for r in self.results if r.file is not None and r.file.bytes)
+
+
+@dataclass(frozen=True)
+class UploadProgress:
+    filename: str
+    bytes_sent: int
+    total_bytes: int
+    parts_done: int
+    parts_total: int
+    elapsed_s: float
+
+    @property
+    def throughput_bps(self) -> float:
+        """Débit moyen depuis le début, en octets/s."""
+        return self.bytes_sent / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
 class FilesApi:
-    def __init__(self, client: OpenAI = None):
+    def __init__(self, client: OpenAI = None, retry: RetryPolicy | None = None):
         self.client = client or OpenAI()
+        # Retry par part pour upload_large (en plus des retries internes du client openai).
+        # Renvoyer une part est sans risque: 500 inclus.
+        self.retry = retry or RetryPolicy(
+            max_attempts=5, retry_on_status=frozenset({408, 429, 500, 502, 503, 504})
+        )
+        self.log = get_logger("optimation.connectors.openai")
+
+
+
+    def upload_file(
+        self,
+        file_path: str,
+        purpose: str = 'user_data',
+        expires_after_s: Optional[int] = None,
+    ) -> FileObject:
+        if os.path.getsize(file_path) >= CHUNKED_UPLOAD_BYTES:
+            return self.upload_large(file_path, purpose=purpose, expires_after_s=expires_after_s)
+        with open(file_path, 'rb') as f:
+            return self.client.files.create(
+                file=f,
+                purpose=purpose,
+                **_expires_after(expires_after_s)
+            )
 
-        
-    
-    def upload_file(self, file_path:str) -> FileObject:
+
+    def upload_bytes(
+        self,
+        data: bytes,
+        filename: str,
+        purpose: str = 'user_data',
+        expires_after_s: Optional[int] = None,
+    ) -> FileObject:
         return self.client.files.create(
-            file=open(file_path, 'rb'),
-            purpose='user_data'
+            file=(filename, data),
+            purpose=purpose,
+            **_expires_after(expires_after_s)
+        )
+
+
+    def upload_large(
+        self,
+        file_path: str,
+        *,
+        purpose: str = 'user_data',
+        mime_type: Optional[str] = None,
+        part_size: int = MAX_PART_BYTES,
+        concurrency: int = 4,
+        expires_after_s: Optional[int] = None,
+        on_progress: Optional[Callable[[UploadProgress], None]] = None,
+    ) -> FileObject:
+        """
+        Upload en parts (API uploads): parts lues depuis le disque et envoyées en
+        parallèle, au plus `concurrency` parts en mémoire. Chaque part est retentée
+        seule (self.retry). Échec: l'upload est annulé côté OpenAI.
+        on_progress: appelé (depuis les threads d'upload) après chaque part.
+        """
+        total = os.path.getsize(file_path)
+        filename = os.path.basename(file_path)
+        part_size = max(1, min(part_size, MAX_PART_BYTES))
+        parts_total = max(1, -(-total // part_size))
+        mime_type = mime_type or mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+        try:
+            upload = self.client.uploads.create(
+                bytes=total,
+                filename=filename,
+                mime_type=mime_type,
+                purpose=purpose,
+                **_expires_after(expires_after_s)
+            )
+        except APIStatusError as e:
+            raise _map_api_error(e) from e
+
+        lock = threading.Lock()
+        started = time.monotonic()
+        state = {'bytes': 0, 'parts': 0}
+
+        def send_part(index: int) -> str:
+            with open(file_path, 'rb') as f:
+                f.seek(index * part_size)
+                data = f.read(part_size)
+            part = self.retry.call(
+                lambda: self.client.uploads.parts.create(upload.id, data=data),
+                retry_if=lambda e: _retryable_part_error(self.retry, e),
+                retry_after=_retry_after,
+                label=f"upload {filename} part {index + 1}/{parts_total}",
+                log=self.log,
+            )
+            with lock:
+                state['bytes'] += len(data)
+                state['parts'] += 1
+                progress = UploadProgress(
+                    filename, state['bytes'], total, state['parts'], parts_total,
+                    time.monotonic() - started,
+                )
+            if on_progress is not None:
+                on_progress(progress)
+            return part.id
+
+        try:
+            # fenêtre = concurrency: jamais plus de `concurrency` parts lues en mémoire
+            part_ids = list(_map_bounded(send_part, range(parts_total), concurrency, concurrency))
+            completed = self.client.uploads.complete(upload.id, part_ids=part_ids)
+        except BaseException as e:
+            try:
+                self.client.uploads.cancel(upload.id)
+            except APIError:
+                pass
+            if isinstance(e, APIStatusError):
+                raise _map_api_error(e) from e
+            raise
+
+        elapsed = time.monotonic() - started
+        self.log.info(
+            "Uploaded %s (%d bytes, %d parts) in %.1fs (%.1f MB/s)",
+            filename, total, parts_total, elapsed, total / max(elapsed, 1e-9) / 1e6,
         )
-    
+        return completed.file
+
 
     def delete_file(self, file_id)-> FileDeleted:
         return self.client.files.delete(file_id)
-    
+
 
     def list_files(self) -> SyncCursorPage[FileObject]:
         return self.client.files.list()
 
-    
+
+    def iter_files(
+        self,
+        *,
+        purpose: Optional[str] = None,
+        older_than_s: Optional[float] = None,
+        newer_than_s: Optional[float] = None,
+        name_prefix: Optional[str] = None,
+        page_size: int = 10000,
+    ) -> Iterator[FileObject]:
+        """
+        Tous les fichiers, page par page (curseur `after`, pages de `page_size`),
+        filtrés par purpose (côté API), âge et préfixe de nom (côté client).
+        """
+        now = time.time()
+        params: dict[str, Any] = {'limit': page_size, 'order': 'asc'}
+        if purpose:
+            params['purpose'] = purpose
+
+        page = self.client.files.list(**params)
+        while True:
+            for file in page.data:
+                age = now - file.created_at
+                if older_than_s is not None and age < older_than_s:
+                    continue
+                if newer_than_s is not None and age > newer_than_s:
+                    continue
+                if name_prefix and not file.filename.startswith(name_prefix):
+                    continue
+                yield file
+            if not page.has_next_page():
+                return
+            page = page.get_next_page()
+
+
+    def delete_many(
+        self,
+        files: Iterable[str | FileObject],
+        *,
+        concurrency: int = 16,
+        dry_run: bool = False,
+    ) -> BulkReport:
+        """
+        Supprime en parallèle (pool borné). Une erreur n'arrête pas le lot: elle est
+        dans le FileOpResult correspondant. Un fichier déjà supprimé (404) est en erreur.
+        `files` est lu en entier avant la première suppression: supprimer pendant que
+        iter_files pagine (curseur `after`) pourrait sauter des fichiers.
+
+            files.delete_many(files.iter_files(older_than_s=7 * 86400), dry_run=True)
+        """
+        files = list(files)
+
+        def delete(item: str | FileObject) -> FileOpResult:
+            file = item if isinstance(item, FileObject) else None
+            file_id = item.id if file is not None else item
+            if dry_run:
+                return FileOpResult(file_id, file=file)
+            try:
+                return FileOpResult(file_id, file=file, deleted=self.delete_file(file_id))
+            except APIStatusError as e:
+                return FileOpResult(file_id, file=file, error=_map_api_error(e))
+            except APIError as e:
+                return FileOpResult(file_id, file=file, error=e)
+
+        return _run_bulk(delete, files, concurrency, dry_run)
+
+
+    def upload_many(
+        self,
+        file_paths: Iterable[str],
+        *,
+        purpose: str = 'user_data',
+        expires_after_s: Optional[int] = None,
+        concurrency: int = 8,
+        dry_run: bool = False,
+    ) -> BulkReport:
+        """Upload en parallèle, un FileOpResult par chemin (ordre d'entrée)."""
+        def upload(path: str) -> FileOpResult:
+            path = os.fspath(path)
+            try:
+                if dry_run:
+                    os.stat(path)
+                    return FileOpResult(path)
+                return FileOpResult(
+                    path, file=self.upload_file(path, purpose, expires_after_s)
+                )
+            except APIStatusError as e:
+                return FileOpResult(path, error=_map_api_error(e))
+            except (APIError, OSError) as e:
+                return FileOpResult(path, error=e)
+
+        return _run_bulk(upload, file_paths, concurrency, dry_run)
+
+
     def delete_all_file(self) -> Optional[list[FileDeleted]]:
         """
             WARNING VERY DESTRUCTIVE
             delete all the file into the open ai file service
             use at your own risk
         """
-        files = self.list_files()
-        deleted_files = list()
+        report = self.delete_many(list(self.iter_files()))
 
-        if not files:
+        if not report.results:
             return None
-        
-        for file in files:
-            deleted_file = self.delete_file(file.id)
-            deleted_files.append(deleted_file)
-        
-        return deleted_files
 
+        for result in report.failed:
+            raise result.error
+
+        return [result.deleted for result in report.results]
+
+
+def _expires_after(expires_after_s: Optional[int]) -> dict[str, Any]:
+    if expires_after_s is None:
+        return {}
+    return {'expires_after': {'anchor': 'created_at', 'seconds': expires_after_s}}
+
+
+def _run_bulk(
+    fn: Callable[[Any], FileOpResult],
+    items: Iterable[Any],
+    concurrency: int,
+    dry_run: bool,
+) -> BulkReport:
+    report = BulkReport(dry_run=dry_run)
+    start = time.monotonic()
+    report.results.extend(_map_bounded(fn, items, concurrency, 2 * max(1, concurrency)))
+    report.elapsed_s = time.monotonic() - start
+    return report
+
+
+def _map_bounded(
+    fn: Callable[[Any], T], items: Iterable[Any], concurrency: int, window: int
+) -> Iterator[T]:
+    # Au plus `window` tâches en vol: l'itérable (ex: iter_files) est lu au fil de l'eau.
+    # Résultats dans l'ordre d'entrée; une exception remonte et annule le reste.
+    items = iter(items)
+    pending: deque[Future] = deque()
+    pool = ThreadPoolExecutor(max_workers=max(1, concurrency))
+
+    def submit_next() -> bool:
+        item = next(items, None)
+        if item is None:
+            return False
+        pending.append(pool.submit(fn, item))
+        return True
+
+    try:
+        for _ in range(max(1, window)):
+            if not submit_next():
+                break
+        while pending:
+            result = pending.popleft().result()
+            submit_next()
+            yield result
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _retryable_part_error(policy: RetryPolicy, e: BaseException) -> bool:
+    if isinstance(e, APIStatusError):
+        # une part renvoyée n'est pas dupliquée: seules les part_ids listées sont assemblées
+        return policy.is_retryable('POST', e.status_code, idempotent=True)
+    return isinstance(e, APIConnectionError) and policy.is_retryable('POST', 0, idempotent=True)
+
+
+def _retry_after(e: BaseException) -> Optional[float]:
+    response = getattr(e, 'response', None)
+    return parse_retry_after(response.headers.get('retry-after')) if response is not None else None
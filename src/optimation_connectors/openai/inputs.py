@@ -0,0 +1,167 @@
+import base64
+import binascii
+import hashlib
+import mimetypes
+import os
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+from .exceptions import OcrInputError
+
+DocumentInput = Union[bytes, bytearray, memoryview, str, os.PathLike, BinaryIO]
+
+ACCEPTED_MIME_TYPES = {'image/jpeg', 'image/png', 'image/gif', 'image/webp', 'application/pdf'}
+
+# Multiple de 3: chaque bloc s'encode en base64 sans padding intermédiaire
+CHUNK_SIZE = 3 * 256 * 1024
+
+
+class DocumentSource:
+    """
+    Document local à envoyer (chemin, bytes/memoryview, fichier ouvert ou base64 déjà fait).
+    Lu à la demande, par blocs: rien n'est copié tant qu'on ne construit pas la requête.
+    """
+
+    def __init__(self, document: DocumentInput, filename: str | None = None) -> None:
+        self._view: Optional[memoryview] = None
+        self._path: Optional[Path] = None
+        self._file: Optional[BinaryIO] = None
+        self._file_start = 0
+        self._base64: Optional[str] = None
+        self._sha256: Optional[str] = None
+
+        if isinstance(document, (bytes, bytearray, memoryview)):
+            self._view = memoryview(document).cast("B")
+        elif isinstance(document, (str, os.PathLike)):
+            self._path = Path(document)
+            if not self._path.is_file():
+                raise OcrInputError(f"Document not found: {self._path}")
+            filename = filename or self._path.name
+        elif hasattr(document, "read"):
+            if document.seekable():
+                self._file = document
+                self._file_start = document.tell()
+            else:  # flux non rejouable (pipe): lu une fois
+                self._view = memoryview(document.read())
+            name = getattr(document, "name", None)
+            if not filename and isinstance(name, str):
+                filename = os.path.basename(name)
+        else:
+            raise OcrInputError(f"Unsupported document type: {type(document).__name__}")
+        self.filename = filename
+
+    @classmethod
+    def from_base64(cls, data: str, filename: str | None = None) -> "DocumentSource":
+        source = cls(b"", filename)
+        source._view = None
+        source._base64 = data
+        return source
+
+    @property
+    def size(self) -> int:
+        """Taille en octets du document (décodé)."""
+        if self._base64 is not None:
+            return len(self._base64) * 3 // 4 - self._base64[-2:].count("=")
+        if self._view is not None:
+            return self._view.nbytes
+        if self._path is not None:
+            return self._path.stat().st_size
+        end = self._file.seek(0, os.SEEK_END)
+        self._file.seek(self._file_start)
+        return end - self._file_start
+
+    @property
+    def encoded_size(self) -> int:
+        """Taille du base64 correspondant (ce qui partirait inline)."""
+        return 4 * ((self.size + 2) // 3)
+
+    def head(self, n: int = 1024) -> bytes:
+        if self._base64 is not None:
+            return base64.b64decode(self._base64[: 4 * ((n + 2) // 3)])[:n]
+        chunks = self.chunks(n)
+        try:
+            return bytes(next(chunks, b""))[:n]
+        finally:
+            chunks.close()
+
+    def chunks(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes | memoryview]:
+        if self._base64 is not None:
+            yield self.read_bytes()
+        elif self._view is not None:
+            for start in range(0, self._view.nbytes, chunk_size):
+                yield self._view[start:start + chunk_size]
+        elif self._path is not None:
+            with self._path.open("rb") as f:
+                while chunk := f.read(chunk_size):
+                    yield chunk
+        else:
+            self._file.seek(self._file_start)
+            while chunk := self._file.read(chunk_size):
+                yield chunk
+
+    def read_bytes(self) -> bytes | memoryview:
+        if self._base64 is not None:
+            return base64.b64decode(self._base64)
+        if self._view is not None:
+            return self._view
+        if self._path is not None:
+            return self._path.read_bytes()
+        self._file.seek(self._file_start)
+        return self._file.read()
+
+    def sha256(self) -> str:
+        if self._sha256 is None:
+            digest = hashlib.sha256()
+            for chunk in self.chunks():
+                digest.update(chunk)
+            self._sha256 = digest.hexdigest()
+        return self._sha256
+
+    def mime_type(self) -> Optional[str]:
+        return sniff_mime_type(self.head(), self.filename)
+
+    def data_uri(self, mime_type: str) -> str:
+        """
+        `data:<mime>;base64,...` encodé en une passe dans un buffer préalloué:
+        pic mémoire ~ taille encodée (+ le str final), jamais le fichier entier en double.
+        """
+        if self._base64 is not None:
+            return f"data:{mime_type};base64,{self._base64}"
+
+        prefix = f"data:{mime_type};base64,".encode("ascii")
+        out = bytearray(len(prefix) + self.encoded_size)
+        out[:len(prefix)] = prefix
+        pos = len(prefix)
+        carry = b""
+        for chunk in self.chunks():
+            if carry:
+                chunk = carry + bytes(chunk)
+            cut = len(chunk) - len(chunk) % 3
+            encoded = binascii.b2a_base64(chunk[:cut], newline=False)
+            out[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+            carry = bytes(chunk[cut:])
+        if carry:
+            encoded = binascii.b2a_base64(carry, newline=False)
+            out[pos:pos + len(encoded)] = encoded
+            pos += len(encoded)
+        if pos != len(out):  # fichier modifié pendant la lecture
+            del out[pos:]
+        return out.decode("ascii")
+
+
+def sniff_mime_type(head: bytes, filename: str | None = None) -> Optional[str]:
+    """Type MIME d'après les premiers octets (signature), sinon d'après l'extension."""
+    if b"%PDF-" in head[:1024]:
+        return "application/pdf"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if head.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if head.startswith((b"GIF87a", b"GIF89a")):
+        return "image/gif"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if filename:
+        return mimetypes.guess_type(filename)[0]
+    return None
@@ -1,15 +1,112 @@
-from typing import Any
-from openai import OpenAI
-from openai import BadRequestError
+import asyncio
+import hashlib
+import json
+import mimetypes
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Iterable, Iterator, Literal, Mapping, Optional
 
-from optimation_core.exceptions import ApiError
-from .exceptions import OcrBadMimeTypeError, OcrInputError
+import jiter
+from openai import APIError, APIStatusError, AsyncOpenAI, NotFoundError, OpenAI
+from pydantic import TypeAdapter
 
-class OcrApi:
-    def __init__(self, client: OpenAI = None):
-        self.client = client or OpenAI()
+from optimation_core.cache import Cache, CacheStats
+from optimation_core.exceptions import ApiError, RateLimitError
+from optimation_core.rate_limit import RateLimiter, TokenBucket, estimate_tokens
+from .exceptions import OcrBadMimeTypeError, OcrInputError, _map_api_error
+from .file_index import FileIndex
+from .files import FilesApi
+from .inputs import ACCEPTED_MIME_TYPES, DocumentInput, DocumentSource
+from .pdf import split_pdf
+
+# Erreurs isolées par document dans extract_many (le lot continue)
+DOCUMENT_ERRORS = (OcrInputError, ApiError, RateLimitError, APIError)
+
+# Un file_id n'est réutilisé que s'il reste valide au moins ce temps (requête en cours)
+UPLOAD_MIN_TTL_S = 600
+
+# Codes d'erreur OpenAI d'un file_id supprimé / expiré (ré-upload possible)
+STALE_FILE_CODES = frozenset({"file_not_found", "not_found"})
+
+
+@dataclass(init=False)
+class OcrStreamEvent:
+    """
+    Événement de `extract_stream`:
+    - "delta": nouveau morceau de texte (`delta`), `text` = texte cumulé (construit à la
+      lecture seulement: ne pas le lire à chaque delta si seul `delta` sert)
+    - "partial" (avec schema): JSON partiel décodé à ce stade (`value`, dict)
+    - "done": résultat final (`value` = objet schema ou texte), `text` complet
+    """
+    type: Literal["delta", "partial", "done"]
+    delta: str
+    value: Any
+
+    def __init__(
+        self,
+        type: Literal["delta", "partial", "done"],
+        text: str | Callable[[], str] = "",
+        delta: str = "",
+        value: Any = None,
+    ) -> None:
+        self.type = type
+        self._text = text
+        self.delta = delta
+        self.value = value
+
+    @property
+    def text(self) -> str:
+        if callable(self._text):
+            self._text = self._text()
+        return self._text
+
+
+@dataclass
+class OcrResult:
+    """Résultat d'un document de `extract_many` (value ou error, jamais les deux)."""
+    index: int
+    value: Any = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _BaseOcrApi:
+    def __init__(
+        self,
+        rate_limiter: RateLimiter | None = None,
+        document_tokens: int = 1500,
+        cache: Cache | None = None,
+        file_index: FileIndex | None = None,
+        upload_threshold_bytes: int | None = 1024 * 1024,
+        upload_ttl_s: int = 7 * 24 * 3600,
+    ):
+        # Budget requêtes/tokens partagé (ex: SqliteTokenBucket entre workers)
+        self.rate_limiter = rate_limiter
+        # Coût estimé d'un document (pages/images) pour le budget tokens/min
+        self.document_tokens = document_tokens
+        # Cache des résultats, adressé par contenu (document, prompts, modèle, schema)
+        self._cache = cache
+        # document local >= seuil (taille base64): uploadé une fois puis
+        # référencé par file_id (None = jamais)
+        self.upload_threshold_bytes = upload_threshold_bytes
+        self.upload_ttl_s = upload_ttl_s
+        self._file_index = file_index
+
+    @property
+    def file_index(self) -> FileIndex:
+        if self._file_index is None:
+            self._file_index = FileIndex()
+        return self._file_index
+
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        return self._cache.stats if self._cache is not None else None
 
-    
 
     def _build_content(
         self,
@@ -17,22 +114,23 @@ class OcrApi:
         mime_type: str,
         *,
         url: str | None = None,
-        base64_data: str | None = None,
+        data_uri: str | None = None,
         file_id: str | None = None,
+        filename: str | None = None,
     ) -> list:
         """Construit le contenu du message selon les inputs fournis."""
 
         # we verified that only one files is provided
 
-        sources = [url, base64_data, file_id]
+        sources = [url, data_uri, file_id]
 
         if sum(x is not None for x in sources) != 1:
             raise OcrInputError(
-                "Exactly one of (url, base64_data, file_id) must be provided."
+                "Exactly one of (url, base64_data, document, file_id) must be provided."
             )   
          
         
-        accepted_types = {'image/jpeg', 'image/png', 'image/gif', 'image/webp', 'application/pdf'}
+        accepted_types = ACCEPTED_MIME_TYPES
             
         if mime_type not in accepted_types:
                 raise OcrBadMimeTypeError(f"File type {mime_type} not supported. Use {sorted(accepted_types)}")
@@ -47,23 +145,22 @@ class OcrApi:
             else:
                 content.append({"type": "input_file", "file_url": url})
         
-        elif base64_data:
+        elif data_uri:
             if is_image:
-                content.append({
-                    "type": "input_image",
-                    "filename": "a.pdf", #TODO fixe naming
-                    "file_data": f"data:{mime_type};base64,{base64_data}",
-                })
+                content.append({"type": "input_image", "image_url": data_uri})
 
             else:    
                 content.append({
                     "type": "input_file",
-                    "filename": "a.pdf", #TODO fixe naming
-                    "file_data": f"data:{mime_type};base64,{base64_data}",
+                    "filename": filename or f"document{mimetypes.guess_extension(mime_type)}",
+                    "file_data": data_uri,
                 })
 
         elif file_id:
-            content.append({"type": "input_file", "file_id": file_id})            
+            if is_image:
+                content.append({"type": "input_image", "file_id": file_id})
+            else:
+                content.append({"type": "input_file", "file_id": file_id})
 
         return content
 
@@ -74,23 +171,70 @@ class OcrApi:
         messages.append({"role": "user", "content": content})
         return messages
 
-    def extract_data(
+    def _split_source(
+        self, document: Mapping[str, Any]
+    ) -> tuple[dict[str, Any], Optional[DocumentSource]]:
+        """
+        Sépare le document local (base64_data / document) du reste des arguments
+        et fixe mime_type (fourni, sinon détecté, sinon PDF).
+        """
+        rest = {name: value for name, value in document.items() if value is not None}
+        base64_data = rest.pop("base64_data", None)
+        local = rest.pop("document", None)
+        filename = rest.pop("filename", None)
+        if base64_data is not None and local is not None:
+            raise OcrInputError("Provide either base64_data or document, not both.")
+        if (base64_data is not None or local is not None) and (
+            rest.get("url") is not None or rest.get("file_id") is not None
+        ):
+            raise OcrInputError(
+                "Exactly one of (url, base64_data, document, file_id) must be provided."
+            )
+
+        source = None
+        if local is not None:
+            source = DocumentSource(local, filename)
+        elif base64_data is not None:
+            source = DocumentSource.from_base64(base64_data, filename)
+
+        if not rest.get("mime_type"):
+            if source is not None:
+                mime_type = source.mime_type()
+            else:
+                mime_type = mimetypes.guess_type(rest.get("url") or "")[0]
+            rest["mime_type"] = mime_type or "application/pdf"
+        return rest, source
+
+    def _request(self, document: Mapping[str, Any]) -> tuple[dict[str, Any], int]:
+        """kwargs complets, document local envoyé inline (data URI)."""
+        rest, source = self._split_source(document)
+        if source is None:
+            return self._prepare(**rest)
+        return self._prepare(
+            **rest, data_uri=source.data_uri(rest["mime_type"]), filename=source.filename
+        )
+
+    def _prepare(
         self,
         url: str = None,
-        base64_data: str = None,
         file_id: str = None,
         prompt: str = "Analyse ce document.",
         model: str = "gpt-5.2",
         schema: Any = None,
         system_prompt: str = None,
         mime_type: str = "application/pdf",
-    ) -> Any:
+        estimated_tokens: int | None = None,
+        data_uri: str | None = None,
+        filename: str | None = None,
+    ) -> tuple[dict[str, Any], int]:
+        """(kwargs de responses.parse, coût estimé en tokens)"""
         content = self._build_content(
             prompt=prompt,
             mime_type=mime_type,
             url=url,
-            base64_data=base64_data,
-            file_id=file_id
+            data_uri=data_uri,
+            file_id=file_id,
+            filename=filename,
         )
         messages = self._build_messages(content, system_prompt)
 
@@ -99,42 +243,667 @@ class OcrApi:
         if schema:
             kwargs["text_format"] = schema
 
+        if estimated_tokens is None:
+            estimated_tokens = estimate_tokens(prompt, system_prompt) + self.document_tokens
+        return kwargs, estimated_tokens
+
+    def _cache_key(
+        self, rest: dict[str, Any], source: Optional[DocumentSource]
+    ) -> Optional[str]:
+        if self._cache is None:
+            return None
+        # Document local représenté par le hash de son contenu (inline ou uploadé: même clé)
+        if source is not None:
+            rest = {**rest, "file_id": f"sha256:{source.sha256()}"}
+        kwargs, _ = self._prepare(**rest)
+        # input contient prompts + document (hash, file_id ou url): le hash couvre tout
+        schema = kwargs.get("text_format")
+        payload = {
+            "model": kwargs["model"],
+            "input": kwargs["input"],
+            "schema": TypeAdapter(schema).json_schema() if schema is not None else None,
+        }
+        raw = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        return f"ocr:{hashlib.sha256(raw).hexdigest()}"
+
+    def _cache_get(self, key: Optional[str], schema: Any) -> tuple[bool, Any]:
+        if key is None:
+            return False, None
+        raw = self._cache.get(key)
+        if raw is None:
+            return False, None
+        # Réhydraté à chaque hit: objet pydantic neuf, jamais partagé avec le cache
+        return True, TypeAdapter(schema).validate_json(raw) if schema else raw.decode("utf-8")
+
+    def _cache_set(self, key: Optional[str], schema: Any, value: Any) -> None:
+        if key is None or value is None:
+            return
+        raw = TypeAdapter(schema).dump_json(value) if schema else value.encode("utf-8")
+        self._cache.set(key, raw)
+
+    def _lookup(
+        self, document: Mapping[str, Any]
+    ) -> tuple[dict[str, Any], Optional[DocumentSource], Optional[str], bool, Any]:
+        """(rest, source, clé de cache, hit, valeur): entrées résolues puis cache lu."""
+        rest, source = self._split_source(document)
+        key = self._cache_key(rest, source)
+        hit, value = self._cache_get(key, rest.get("schema"))
+        return rest, source, key, hit, value
+
+    def _indexed_file_id(self, source: DocumentSource) -> Optional[str]:
+        return self.file_index.get(source.sha256(), min_ttl_s=UPLOAD_MIN_TTL_S)
+
+    def _should_upload(self, source: Optional[DocumentSource]) -> bool:
+        threshold = self.upload_threshold_bytes
+        return source is not None and threshold is not None and source.encoded_size >= threshold
+
+    def _inline(self, rest: dict[str, Any], source: Optional[DocumentSource]) -> dict[str, Any]:
+        if source is None:
+            return {}
+        return {"data_uri": source.data_uri(rest["mime_type"]), "filename": source.filename}
+
+    def _upload_name(self, source: DocumentSource, mime_type: str) -> str:
+        return source.filename or f"{source.sha256()[:16]}{mimetypes.guess_extension(mime_type)}"
+
+    def _remember_upload(
+        self, source: DocumentSource, filename: str, file_id: str, expires_at: Optional[int]
+    ) -> None:
+        if expires_at is None:
+            expires_at = time.time() + self.upload_ttl_s
+        self.file_index.put(source.sha256(), file_id, filename, source.size, expires_at)
+
+    def _batch_limiter(self, tokens_per_minute: int | None) -> RateLimiter | None:
+        if tokens_per_minute is None:
+            return self.rate_limiter
+        # Budget propre au lot, en plus du limiteur partagé éventuel
+        return RateLimiter(
+            requests=self.rate_limiter.requests if self.rate_limiter else None,
+            tokens=TokenBucket.per_minute(tokens_per_minute),
+            max_wait_s=self.rate_limiter.max_wait_s if self.rate_limiter else None,
+        )
+
+
+class OcrApi(_BaseOcrApi):
+    def __init__(
+        self,
+        client: OpenAI = None,
+        rate_limiter: RateLimiter | None = None,
+        document_tokens: int = 1500,
+        cache: Cache | None = None,
+        file_index: FileIndex | None = None,
+        upload_threshold_bytes: int | None = 1024 * 1024,
+        upload_ttl_s: int = 7 * 24 * 3600,
+    ):
+        """
+        upload_threshold_bytes: au-delà (taille base64), le document est uploadé une
+        seule fois et réutilisé par file_id (index par hash, partagé entre process).
+        upload_ttl_s: durée de vie des uploads côté OpenAI (expires_after).
+        """
+        super().__init__(
+            rate_limiter=rate_limiter,
+            document_tokens=document_tokens,
+            cache=cache,
+            file_index=file_index,
+            upload_threshold_bytes=upload_threshold_bytes,
+            upload_ttl_s=upload_ttl_s,
+        )
+        self.client = client or OpenAI()
+        self.files = FilesApi(client=self.client)
+
+    def extract_data(
+        self,
+        url: str = None,
+        base64_data: str = None,
+        file_id: str = None,
+        prompt: str = "Analyse ce document.",
+        model: str = "gpt-5.2",
+        schema: Any = None,
+        system_prompt: str = None,
+        mime_type: str | None = None,
+        estimated_tokens: int | None = None,
+        document: DocumentInput | None = None,
+        filename: str | None = None,
+    ) -> Any:
+        """
+        Un seul parmi url / base64_data / document (chemin, bytes, memoryview,
+        fichier ouvert) / file_id. mime_type: détecté d'après le contenu si omis.
+        """
+        return self._extract(
+            self.rate_limiter,
+            url=url,
+            base64_data=base64_data,
+            file_id=file_id,
+            prompt=prompt,
+            model=model,
+            schema=schema,
+            system_prompt=system_prompt,
+            mime_type=mime_type,
+            estimated_tokens=estimated_tokens,
+            document=document,
+            filename=filename,
+        )
+
+    def extract_many(
+        self,
+        documents: Iterable[Mapping[str, Any]],
+        *,
+        concurrency: int = 4,
+        ordered: bool = True,
+        tokens_per_minute: int | None = None,
+        max_pending: int | None = None,
+        **options: Any,
+    ) -> Iterator[OcrResult]:
+        """
+        OCR d'un lot de documents en parallèle (threads: c'est de l'I/O).
+        - documents: kwargs de `extract_data` par document (url/document/file_id,
+          mime_type...), `options` = valeurs communes (prompt, model, schema...)
+        - ordered=True: résultats dans l'ordre d'entrée, sinon au fil de l'eau
+        - tokens_per_minute: budget du lot (sinon le rate_limiter du client)
+        - une erreur de document (OcrInputError, ApiError...) donne un OcrResult
+          avec `error`, sans interrompre le lot
+        Au plus `max_pending` (défaut 2 x concurrency) documents en vol:
+        l'itérable peut être paresseux, la mémoire reste bornée.
+        """
+        limiter = self._batch_limiter(tokens_per_minute)
+        docs = enumerate(documents)
+        pending: deque[Future] = deque()
+        pool = ThreadPoolExecutor(max_workers=max(1, concurrency))
+
+        def submit_next() -> bool:
+            item = next(docs, None)
+            if item is None:
+                return False
+            index, document = item
+            pending.append(pool.submit(self._extract_one, limiter, index, {**options, **document}))
+            return True
+
+        try:
+            for _ in range(max_pending or 2 * max(1, concurrency)):
+                if not submit_next():
+                    break
+            while pending:
+                if ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = next(f for f in pending if f in done)
+                    pending.remove(future)
+                submit_next()
+                yield future.result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def extract_pdf(
+        self,
+        pdf: DocumentInput,
+        *,
+        pages_per_chunk: int = 10,
+        concurrency: int = 4,
+        max_inflight_pages: int = 80,
+        reducer: Callable[[Any, Any], Any] | None = None,
+        separator: str = "\n\n",
+        **options: Any,
+    ) -> Any:
+        """
+        OCR d'un gros PDF découpé localement en plages de pages (pypdf, extra `pdf`),
+        chunks traités en parallèle puis fusionnés dans l'ordre des pages:
+        - sans schema: textes concaténés avec `separator`
+        - avec schema: `reducer(acc, objet)` appliqué de proche en proche
+          (ex: concaténer les lignes de facture), sinon liste d'objets par chunk
+        max_inflight_pages: pages découpées/en vol au plus (borne la mémoire).
+        Un chunk en échec fait échouer le document (erreur du premier chunk fautif).
+        """
+        data = DocumentSource(pdf).read_bytes()
+        pages_per_chunk = max(1, pages_per_chunk)
+        max_pending = max(1, max_inflight_pages // pages_per_chunk)
+
+        chunks = (
+            {
+                "document": chunk,
+                "mime_type": "application/pdf",
+                "filename": f"pages-{start + 1}-{end}.pdf",
+            }
+            for start, end, chunk in split_pdf(data, pages_per_chunk)
+        )
+        results = self.extract_many(
+            chunks,
+            concurrency=min(concurrency, max_pending),
+            max_pending=max_pending,
+            **options,
+        )
+
+        merged: Any = None
+        parts: list[Any] = []
+        for i, result in enumerate(results):
+            if not result.ok:
+                results.close()
+                raise result.error
+            if reducer is not None:
+                merged = result.value if i == 0 else reducer(merged, result.value)
+            else:
+                parts.append(result.value)
+
+        if reducer is not None:
+            return merged
+        if options.get("schema"):
+            return parts
+        return separator.join(parts)
+
+    def extract_stream(
+        self,
+        url: str = None,
+        base64_data: str = None,
+        file_id: str = None,
+        prompt: str = "Analyse ce document.",
+        model: str = "gpt-5.2",
+        schema: Any = None,
+        system_prompt: str = None,
+        mime_type: str | None = None,
+        estimated_tokens: int | None = None,
+        document: DocumentInput | None = None,
+        filename: str | None = None,
+    ) -> Iterator[OcrStreamEvent]:
+        """
+        Comme `extract_data`, mais en flux (responses.stream): événements "delta" dès
+        les premiers tokens, "partial" si schema, puis un "done" avec le résultat final.
+        Un hit de cache donne directement "done".
+        """
+        rest, source, key, hit, value = self._lookup({
+            "url": url, "base64_data": base64_data, "file_id": file_id, "prompt": prompt,
+            "model": model, "schema": schema, "system_prompt": system_prompt,
+            "mime_type": mime_type, "estimated_tokens": estimated_tokens,
+            "document": document, "filename": filename,
+        })
+        if hit:
+            yield _done_event(value, schema)
+            return
+
+        if self._should_upload(source):
+            kwargs, tokens = self._prepare(**rest, file_id=self._upload_once(source, rest))
+        else:
+            kwargs, tokens = self._prepare(**rest, **self._inline(rest, source))
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(tokens=tokens)
+
+        output = _StreamOutput(schema)
+        try:
+            with self.client.responses.stream(**kwargs) as stream:
+                for event in stream:
+                    if event.type == "response.output_text.delta":
+                        yield from output.feed(event.delta)
+                response = stream.get_final_response()
+            yield from output.finish()
+        except APIStatusError as e:
+            raise _map_api_error(e) from e
+
+        value = response.output_parsed if schema else response.output_text
+        self._cache_set(key, schema, value)
+        yield _done_event(value, schema, response.output_text)
+
+    def _extract_one(
+        self, limiter: RateLimiter | None, index: int, document: dict[str, Any]
+    ) -> OcrResult:
+        try:
+            return OcrResult(index, value=self._extract(limiter, **document))
+        except DOCUMENT_ERRORS as e:
+            return OcrResult(index, error=e)
+
+    def _extract(self, limiter: RateLimiter | None, **document: Any) -> Any:
+        rest, source, key, hit, value = self._lookup(document)
+        if hit:
+            return value
+        schema = rest.get("schema")
+
+        upload = self._should_upload(source)
+        if upload:
+            kwargs, tokens = self._prepare(**rest, file_id=self._upload_once(source, rest))
+        else:
+            kwargs, tokens = self._prepare(**rest, **self._inline(rest, source))
+
+        if limiter is not None:
+            limiter.acquire(tokens=tokens)
+
         try:
             response = self.client.responses.parse(**kwargs)
-        except BadRequestError as e:
-            status = getattr(e, "status_code", 400)
-
-            # Essaye de récupérer le body JSON propre
-            error_data = None
-            if hasattr(e, "response") and e.response is not None:
-                try:
-                    error_data = e.response.json()
-                except Exception:
-                    pass
-
-            # Fallback sur le message string
-            message = str(e)
-
-            # Extraire infos si possible
-            error_code = None
-            error_type = None
-            error_param = None
-
-            if error_data and "error" in error_data:
-                err = error_data["error"]
-                message = err.get("message", message)
-                error_code = err.get("code")
-                error_type = err.get("type")
-                error_param = err.get("param")
-
-            raise ApiError(
-                url='openAI Api',
-                status_code=status,
-                message=message,
-                details={
-                    'code': error_code,
-                    'error_type': error_type,
-                    'param': error_param}
-            ) from e
-
-        return response.output_parsed if (schema) else response.output_text
\ No newline at end of file
+        except APIStatusError as e:
+            if not upload or not _stale_file_error(e):
+                raise _map_api_error(e) from e
+            # file_id supprimé côté OpenAI entre-temps: oublié, ré-uploadé, une seule fois
+            self.file_index.forget(source.sha256())
+            kwargs, _ = self._prepare(**rest, file_id=self._upload_once(source, rest))
+            try:
+                response = self.client.responses.parse(**kwargs)
+            except APIStatusError as e:
+                raise _map_api_error(e) from e
+
+        value = response.output_parsed if schema else response.output_text
+        self._cache_set(key, schema, value)
+        return value
+
+    def _upload_once(self, source: DocumentSource, rest: dict[str, Any]) -> str:
+        file_id = self._indexed_file_id(source)
+        if file_id is not None:
+            return file_id
+        filename = self._upload_name(source, rest["mime_type"])
+        file = self.files.upload_bytes(
+            bytes(source.read_bytes()), filename, expires_after_s=self.upload_ttl_s
+        )
+        self._remember_upload(source, filename, file.id, file.expires_at)
+        return file.id
+
+    def gc_uploads(self) -> int:
+        """Retire de l'index (et d'OpenAI si encore présents) les uploads expirés."""
+        removed = 0
+        for sha256, file_id in self.file_index.expired():
+            try:
+                self.files.delete_file(file_id)
+            except NotFoundError:
+                pass  # déjà supprimé par expires_after
+            self.file_index.forget(sha256)
+            removed += 1
+        return removed
+
+
+class AsyncOcrApi(_BaseOcrApi):
+    """Variante asyncio de `OcrApi` (AsyncOpenAI), même contrat."""
+
+    def __init__(
+        self,
+        client: AsyncOpenAI = None,
+        rate_limiter: RateLimiter | None = None,
+        document_tokens: int = 1500,
+        cache: Cache | None = None,
+        file_index: FileIndex | None = None,
+        upload_threshold_bytes: int | None = 1024 * 1024,
+        upload_ttl_s: int = 7 * 24 * 3600,
+    ):
+        """
+        upload_threshold_bytes: au-delà (taille base64), le document est uploadé une
+        seule fois et réutilisé par file_id (index par hash, partagé entre process).
+        upload_ttl_s: durée de vie des uploads côté OpenAI (expires_after).
+        """
+        super().__init__(
+            rate_limiter=rate_limiter,
+            document_tokens=document_tokens,
+            cache=cache,
+            file_index=file_index,
+            upload_threshold_bytes=upload_threshold_bytes,
+            upload_ttl_s=upload_ttl_s,
+        )
+        self.client = client or AsyncOpenAI()
+
+    async def extract_data(
+        self,
+        url: str = None,
+        base64_data: str = None,
+        file_id: str = None,
+        prompt: str = "Analyse ce document.",
+        model: str = "gpt-5.2",
+        schema: Any = None,
+        system_prompt: str = None,
+        mime_type: str | None = None,
+        estimated_tokens: int | None = None,
+        document: DocumentInput | None = None,
+        filename: str | None = None,
+    ) -> Any:
+        """
+        Un seul parmi url / base64_data / document (chemin, bytes, memoryview,
+        fichier ouvert) / file_id. mime_type: détecté d'après le contenu si omis.
+        """
+        return await self._extract(
+            self.rate_limiter,
+            url=url,
+            base64_data=base64_data,
+            file_id=file_id,
+            prompt=prompt,
+            model=model,
+            schema=schema,
+            system_prompt=system_prompt,
+            mime_type=mime_type,
+            estimated_tokens=estimated_tokens,
+            document=document,
+            filename=filename,
+        )
+
+    async def extract_many(
+        self,
+        documents: Iterable[Mapping[str, Any]],
+        *,
+        concurrency: int = 8,
+        ordered: bool = True,
+        tokens_per_minute: int | None = None,
+        **options: Any,
+    ) -> AsyncIterator[OcrResult]:
+        """Comme `OcrApi.extract_many`, avec `concurrency` tâches asyncio."""
+        limiter = self._batch_limiter(tokens_per_minute)
+        docs = enumerate(documents)
+        pending: deque[asyncio.Task] = deque()
+
+        def submit_next() -> bool:
+            item = next(docs, None)
+            if item is None:
+                return False
+            index, document = item
+            coro = self._extract_one(limiter, index, {**options, **document})
+            pending.append(asyncio.ensure_future(coro))
+            return True
+
+        try:
+            for _ in range(max(1, concurrency)):
+                if not submit_next():
+                    break
+            while pending:
+                if ordered:
+                    task = pending.popleft()
+                    result = await task
+                else:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    task = next(t for t in pending if t in done)
+                    pending.remove(task)
+                    result = task.result()
+                submit_next()
+                yield result
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def extract_stream(
+        self,
+        url: str = None,
+        base64_data: str = None,
+        file_id: str = None,
+        prompt: str = "Analyse ce document.",
+        model: str = "gpt-5.2",
+        schema: Any = None,
+        system_prompt: str = None,
+        mime_type: str | None = None,
+        estimated_tokens: int | None = None,
+        document: DocumentInput | None = None,
+        filename: str | None = None,
+    ) -> AsyncIterator[OcrStreamEvent]:
+        """Comme `OcrApi.extract_stream` (itérateur asynchrone)."""
+        # Détection du type, hash, cache: hors de la boucle (fichiers, SQLite)
+        rest, source, key, hit, value = await asyncio.to_thread(self._lookup, {
+            "url": url, "base64_data": base64_data, "file_id": file_id, "prompt": prompt,
+            "model": model, "schema": schema, "system_prompt": system_prompt,
+            "mime_type": mime_type, "estimated_tokens": estimated_tokens,
+            "document": document, "filename": filename,
+        })
+        if hit:
+            yield _done_event(value, schema)
+            return
+
+        if self._should_upload(source):
+            kwargs, tokens = self._prepare(**rest, file_id=await self._upload_once(source, rest))
+        else:
+            kwargs, tokens = self._prepare(**rest, **await self._ainline(rest, source))
+        if self.rate_limiter is not None:
+            await self.rate_limiter.aacquire(tokens=tokens)
+
+        output = _StreamOutput(schema)
+        try:
+            async with self.client.responses.stream(**kwargs) as stream:
+                async for event in stream:
+                    if event.type == "response.output_text.delta":
+                        for item in output.feed(event.delta):
+                            yield item
+                response = await stream.get_final_response()
+            for item in output.finish():
+                yield item
+        except APIStatusError as e:
+            raise _map_api_error(e) from e
+
+        value = response.output_parsed if schema else response.output_text
+        await self._acache_set(key, schema, value)
+        yield _done_event(value, schema, response.output_text)
+
+    async def _extract_one(
+        self, limiter: RateLimiter | None, index: int, document: dict[str, Any]
+    ) -> OcrResult:
+        try:
+            return OcrResult(index, value=await self._extract(limiter, **document))
+        except DOCUMENT_ERRORS as e:
+            return OcrResult(index, error=e)
+
+    async def _extract(self, limiter: RateLimiter | None, **document: Any) -> Any:
+        rest, source, key, hit, value = await asyncio.to_thread(self._lookup, document)
+        if hit:
+            return value
+        schema = rest.get("schema")
+
+        upload = self._should_upload(source)
+        if upload:
+            kwargs, tokens = self._prepare(**rest, file_id=await self._upload_once(source, rest))
+        else:
+            kwargs, tokens = self._prepare(**rest, **await self._ainline(rest, source))
+
+        if limiter is not None:
+            await limiter.aacquire(tokens=tokens)
+
+        try:
+            response = await self.client.responses.parse(**kwargs)
+        except APIStatusError as e:
+            if not upload or not _stale_file_error(e):
+                raise _map_api_error(e) from e
+            # file_id supprimé côté OpenAI entre-temps: oublié, ré-uploadé, une seule fois
+            await asyncio.to_thread(self.file_index.forget, source.sha256())
+            kwargs, _ = self._prepare(**rest, file_id=await self._upload_once(source, rest))
+            try:
+                response = await self.client.responses.parse(**kwargs)
+            except APIStatusError as e:
+                raise _map_api_error(e) from e
+
+        value = response.output_parsed if schema else response.output_text
+        await self._acache_set(key, schema, value)
+        return value
+
+    async def _upload_once(self, source: DocumentSource, rest: dict[str, Any]) -> str:
+        # Hash du contenu et index SQLite dans un thread (sha256 mémorisé ensuite)
+        file_id = await asyncio.to_thread(self._indexed_file_id, source)
+        if file_id is not None:
+            return file_id
+        filename = self._upload_name(source, rest["mime_type"])
+        data = await asyncio.to_thread(lambda: bytes(source.read_bytes()))
+        file = await self.client.files.create(
+            file=(filename, data),
+            purpose="user_data",
+            expires_after={"anchor": "created_at", "seconds": self.upload_ttl_s},
+        )
+        await asyncio.to_thread(self._remember_upload, source, filename, file.id, file.expires_at)
+        return file.id
+
+    async def _ainline(
+        self, rest: dict[str, Any], source: Optional[DocumentSource]
+    ) -> dict[str, Any]:
+        if source is None:
+            return {}
+        # Lecture + base64 du document entier: hors de la boucle
+        return await asyncio.to_thread(self._inline, rest, source)
+
+    async def _acache_set(self, key: Optional[str], schema: Any, value: Any) -> None:
+        if key is not None:
+            await asyncio.to_thread(self._cache_set, key, schema, value)
+
+
+class _StreamOutput:
+    """
+    Cumule les deltas (liste, texte joint à la demande). Avec schema, le JSON partiel
+    (jiter) est re-décodé sur un caractère de structure (`,` `}` `]`) une fois au moins
+    max(PARTIAL_MIN_BYTES, taille / PARTIAL_GROWTH) nouveaux caractères reçus: coût
+    total linéaire, même sur une longue sortie; `finish` fait le décodage final.
+    """
+
+    PARTIAL_MIN_BYTES = 256
+    PARTIAL_GROWTH = 8
+
+    def __init__(self, schema: Any) -> None:
+        self.schema = schema
+        self._parts: list[str] = []
+        self._size = 0
+        self._joined = ""
+        self._joined_parts = 0
+        self._parsed_size = 0
+        self._structural = False
+        self._partial: Any = None
+
+    @property
+    def text(self) -> str:
+        return self._text_at(len(self._parts))
+
+    def feed(self, delta: str) -> list[OcrStreamEvent]:
+        self._parts.append(delta)
+        self._size += len(delta)
+        count = len(self._parts)
+        events = [OcrStreamEvent("delta", text=lambda: self._text_at(count), delta=delta)]
+        if self.schema:
+            self._structural = self._structural or any(c in delta for c in ",}]")
+            pending = self._size - self._parsed_size
+            if self._structural and pending >= max(
+                self.PARTIAL_MIN_BYTES, self._size // self.PARTIAL_GROWTH
+            ):
+                events.extend(self._parse())
+        return events
+
+    def finish(self) -> list[OcrStreamEvent]:
+        """Dernier "partial" (texte complet) s'il diffère du précédent."""
+        if not self.schema or self._parsed_size == self._size:
+            return []
+        return self._parse()
+
+    def _parse(self) -> list[OcrStreamEvent]:
+        self._parsed_size = self._size
+        self._structural = False
+        text = self.text
+        try:
+            partial = jiter.from_json(text.encode("utf-8"), partial_mode="trailing-strings")
+        except ValueError:
+            return []
+        if partial == self._partial:
+            return []
+        self._partial = partial
+        return [OcrStreamEvent("partial", text=text, value=partial)]
+
+    def _text_at(self, count: int) -> str:
+        # Jointure incrémentale: chaque delta n'est copié qu'une fois dans le texte cumulé
+        if count < self._joined_parts:
+            return "".join(self._parts[:count])
+        if count > self._joined_parts:
+            self._joined += "".join(self._parts[self._joined_parts:count])
+            self._joined_parts = count
+        return self._joined
+
+
+def _done_event(value: Any, schema: Any, text: str | None = None) -> OcrStreamEvent:
+    if text is None:
+        text = TypeAdapter(schema).dump_json(value).decode("utf-8") if schema else value
+    return OcrStreamEvent("done", text=text, value=value)
+
+
+def _stale_file_error(e: APIStatusError) -> bool:
+    if e.status_code == 404:
+        return True
+    # 400: seulement un file_id introuvable (pas n'importe quel message qui parle de "file")
+    param = e.param or ""
+    return e.status_code == 400 and (
+        e.code in STALE_FILE_CODES or param == "file_id" or param.endswith(".file_id")
+    )
@@ -0,0 +1,32 @@
+import io
+from typing import Iterator
+
+try:  # optionnel: pip install optimation-python-sdk[pdf]
+    import pypdf
+except ImportError:
+    pypdf = None
+
+from .exceptions import OcrInputError
+
+
+def split_pdf(data: bytes, pages_per_chunk: int = 10) -> Iterator[tuple[int, int, bytes]]:
+    """
+    Découpe un PDF en sous-PDF de `pages_per_chunk` pages: (première page, fin exclusive, octets).
+    Générateur: un seul chunk construit à la fois.
+    """
+    if pypdf is None:
+        raise ImportError("pypdf is not installed (pip install optimation-python-sdk[pdf])")
+    try:
+        reader = pypdf.PdfReader(io.BytesIO(data))
+        count = len(reader.pages)
+    except pypdf.errors.PdfReadError as e:
+        raise OcrInputError(f"Invalid PDF: {e}") from e
+
+    for start in range(0, count, max(1, pages_per_chunk)):
+        end = min(count, start + pages_per_chunk)
+        writer = pypdf.PdfWriter()
+        for index in range(start, end):
+            writer.add_page(reader.pages[index])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        yield start, end, buffer.getvalue()
@@ -1,3 +1,4 @@
 from .client import ParseClient
+from .where import Where, pointer
 
-__all__ = ["ParseClient"]
+__all__ = ["ParseClient", "Where", "pointer"]
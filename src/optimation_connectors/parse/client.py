@@ -2,7 +2,8 @@ from __future__ import annotations
 
 import os
 
-from optimation_core import ApiClient, ConfigError, get_logger
+from optimation_core import ApiClient, CircuitBreaker, ConfigError, RateLimiter, get_logger
+from optimation_core.cache import Cache
 from .types import ParseCredential
 from .query import QueryApi
 
@@ -13,7 +14,19 @@ class ParseClient:
     Expose des sous-modules (query) comme ton pattern Service Aggregator.
     """
 
-    def __init__(self, cred: ParseCredential | None = None) -> None:
+    def __init__(
+        self,
+        cred: ParseCredential | None = None,
+        *,
+        rate_limiter: RateLimiter | None = None,
+        circuit_breaker: CircuitBreaker | bool = True,
+        cache: Cache | None = None,
+    ) -> None:
+        """
+        circuit_breaker: True = breaker partagé par hôte (échec rapide si Parse est down),
+        False = désactivé, ou une instance CircuitBreaker configurée.
+        cache: cache de lecture pour query (ex: MemoryCache(ttl_s=30)), None = désactivé.
+        """
         self.log = get_logger("optimation.connectors.parse")
 
         if cred is None:
@@ -26,14 +39,20 @@ class ParseClient:
             "X-Parse-Master-Key": cred["master_key"],
         }
 
+        base_url = cred["base_url"].rstrip("/")
+        if circuit_breaker is True:
+            circuit_breaker = CircuitBreaker.for_host(base_url)
+
         self.http = ApiClient(
-            base_url=cred["base_url"].rstrip("/"),
+            base_url=base_url,
             headers=headers,
             logger=self.log,
             timeout_s=15.0,
+            rate_limiter=rate_limiter,
+            circuit_breaker=circuit_breaker or None,
         )
 
-        self.query = QueryApi(self.http)
+        self.query = QueryApi(self.http, cache=cache)
 
     @staticmethod
     def _from_env() -> ParseCredential:
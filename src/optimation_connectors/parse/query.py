@@ -1,26 +1,504 @@
 from __future__ import annotations
 
-from typing import Any, Optional
+import json
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Iterator, Mapping, Optional, Sequence
+from urllib.parse import urlsplit
 
-from optimation_core import ApiClient
+from optimation_core import ApiClient, ApiError, ConnectorError, RateLimitError
+from optimation_core.cache import Cache, CacheStats
+from .scan import ClassScanner
+from .types import BatchItemResult
+
+# Limite par défaut de Parse Server pour /batch
+BATCH_MAX_REQUESTS = 50
+
+# (method, path relatif, body)
+BatchOp = tuple[str, str, Optional[dict]]
 
 
 class QueryApi:
-    def __init__(self, http: ApiClient) -> None:
+    def __init__(self, http: ApiClient, cache: Cache | None = None) -> None:
         self._http = http
+        # Cache de lecture optionnel (get_object / list_class), invalidé par nos écritures
+        self._cache = cache
+        self._cache_ns = f"parse:{http.base_url}:"
 
-    def list_class(self, class_name: str, query_params: dict | None = None) -> list[dict]:
-        # Parse: GET /classes/<ClassName>
-        data = self._http.get(f"/classes/{class_name}", params=query_params)
-        # Parse retourne souvent {"results": [...]}
-        if isinstance(data, dict) and "results" in data:
-            return data["results"] or []
-        return data if isinstance(data, list) else []
+    @property
+    def cache_stats(self) -> CacheStats | None:
+        return self._cache.stats if self._cache is not None else None
+
+    def list_class(
+        self,
+        class_name: str,
+        query_params: dict | None = None,
+        *,
+        where: dict | None = None,
+        keys: Sequence[str] | None = None,
+        include: Sequence[str] | None = None,
+        order: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+    ) -> list[dict]:
+        """
+        `keys` = projection (seulement ces champs), `include` = pointeurs résolus
+        dans la même requête (évite N appels get_object). `query_params` bruts
+        restent acceptés et sont complétés par les arguments nommés.
+        """
+        params = _query_params(
+            query_params, where=where, keys=keys, include=include,
+            order=order, limit=limit, skip=skip,
+        )
+        key = self._list_key(class_name, params)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
+
+        rows = self._fetch_list(class_name, params)
+        self._cache_set(key, rows)
+        return rows
+
+    def stream_class(
+        self,
+        class_name: str,
+        query_params: dict | None = None,
+        *,
+        where: dict | None = None,
+        keys: Sequence[str] | None = None,
+        include: Sequence[str] | None = None,
+        order: str | None = None,
+        limit: int | None = None,
+        skip: int | None = None,
+    ) -> Iterator[dict]:
+        """
+        Comme `list_class`, mais les lignes sont décodées au fil de la réponse
+        (pas de cache): mémoire ~ une ligne, première ligne dispo sans attendre la fin.
+        """
+        params = _query_params(
+            query_params, where=where, keys=keys, include=include,
+            order=order, limit=limit, skip=skip,
+        )
+        return self._http.get(f"/classes/{class_name}", params=params, stream=True)
+
+    def count(self, class_name: str, where: dict | None = None) -> int:
+        # count=1&limit=0: le serveur ne renvoie que le total, aucune ligne
+        params = _query_params(None, where=where, limit=0)
+        params["count"] = 1
+        data = self._http.get(f"/classes/{class_name}", params=params)
+        return int(data.get("count", 0)) if isinstance(data, dict) else 0
+
+    def iter_class(
+        self,
+        class_name: str,
+        where: dict | None = None,
+        *,
+        page_size: int = 1000,
+        order: str | None = None,
+        keys: Sequence[str] | None = None,
+        include: Sequence[str] | None = None,
+        stream: bool = False,
+    ) -> Iterator[dict]:
+        """
+        Parcourt toute une classe, page par page, en générateur (mémoire constante).
+        - par défaut: pagination keyset sur objectId (`objectId > dernier`, order=objectId),
+          chaque page coûte pareil même à 1M de lignes
+        - order="createdAt": keyset sur (createdAt, objectId), même coût par page
+        - autre `order` (ou where fixe un objectId précis): fallback limit/skip
+        - `stream=True`: chaque page est décodée au fil de l'eau (voir `stream_class`)
+        """
+        extra = _query_params(None, keys=keys, include=include)
+        for page in self._pages(class_name, where, page_size, order, extra, stream):
+            yield from page
+
+    def iter_pages(
+        self,
+        class_name: str,
+        where: dict | None = None,
+        *,
+        page_size: int = 1000,
+        order: str | None = None,
+        keys: Sequence[str] | None = None,
+        include: Sequence[str] | None = None,
+    ) -> Iterator[list[dict]]:
+        """Comme `iter_class`, mais une page (liste) à la fois."""
+        extra = _query_params(None, keys=keys, include=include)
+        return self._pages(class_name, where, page_size, order, extra, False)
+
+    def scan_class(
+        self,
+        class_name: str,
+        where: dict | None = None,
+        **options: Any,
+    ) -> Iterator[dict]:
+        """Scan parallèle par shards: voir `ClassScanner` pour les options."""
+        return ClassScanner(self, **options).scan(class_name, where)
+
+    def get_object(
+        self,
+        class_name: str,
+        object_id: str,
+        *,
+        keys: Sequence[str] | None = None,
+        include: Sequence[str] | None = None,
+    ) -> dict[str, Any]:
+        params = _query_params(None, keys=keys, include=include) or None
+        key = self._object_key(class_name, object_id, params)
+        cached = self._cache_get(key)
+        if cached is not None:
+            return cached
 
-    def get_object(self, class_name: str, object_id: str) -> dict[str, Any]:
         # Parse: GET /classes/<ClassName>/<objectId>
-        data = self._http.get(f"/classes/{class_name}/{object_id}")
+        data = self._http.get(f"/classes/{class_name}/{object_id}", params=params)
+        obj = data if isinstance(data, dict) else {"data": data}
+        self._cache_set(key, obj)
+        return obj
+
+    def update_object(self, class_name: str, object_id: str, json:dict) -> dict[str, Any]:
+        try:
+            data = self._http.put(f"/classes/{class_name}/{object_id}", json=json)
+        finally:
+            # Même en erreur (timeout...), l'écriture a pu passer côté serveur
+            self._invalidate(class_name, object_id)
         return data if isinstance(data, dict) else {"data": data}
-    
-    def update_object(self, class_name: str, object_id: str, json:dict):
-        data = self._http.put(f'classes/{class_name}/{object_id}', json=json)
+
+    # ----------------------------
+    # Batch (POST /batch)
+    # ----------------------------
+    def batch_create(
+        self,
+        class_name: str,
+        objects: Iterable[dict],
+        *,
+        chunk_size: int = BATCH_MAX_REQUESTS,
+        concurrency: int = 4,
+    ) -> list[BatchItemResult]:
+        ops = [("POST", f"/classes/{class_name}", obj) for obj in objects]
+        return self._batch(ops, chunk_size, concurrency, idempotent=False)
+
+    def batch_update(
+        self,
+        class_name: str,
+        updates: Mapping[str, dict] | Iterable[tuple[str, dict]],
+        *,
+        chunk_size: int = BATCH_MAX_REQUESTS,
+        concurrency: int = 4,
+    ) -> list[BatchItemResult]:
+        """`updates`: {objectId: champs} ou [(objectId, champs), ...]."""
+        items = updates.items() if isinstance(updates, Mapping) else updates
+        ops = [("PUT", f"/classes/{class_name}/{oid}", body) for oid, body in items]
+        return self._batch(ops, chunk_size, concurrency, idempotent=True)
+
+    def batch_delete(
+        self,
+        class_name: str,
+        object_ids: Iterable[str],
+        *,
+        chunk_size: int = BATCH_MAX_REQUESTS,
+        concurrency: int = 4,
+    ) -> list[BatchItemResult]:
+        ops = [("DELETE", f"/classes/{class_name}/{oid}", None) for oid in object_ids]
+        return self._batch(ops, chunk_size, concurrency, idempotent=True)
+
+    # ----------------------------
+    # Internals
+    # ----------------------------
+    def _batch(
+        self,
+        ops: list[BatchOp],
+        chunk_size: int,
+        concurrency: int,
+        *,
+        idempotent: bool,
+    ) -> list[BatchItemResult]:
+        """
+        Découpe en chunks /batch, envoyés en parallèle (pool borné).
+        Un chunk en échec HTTP marque toutes ses opérations en erreur:
+        le résultat par index permet de ne rejouer que ce qui a échoué.
+        """
+        chunk_size = max(1, min(chunk_size, BATCH_MAX_REQUESTS))
+        chunks = [
+            (start, ops[start:start + chunk_size]) for start in range(0, len(ops), chunk_size)
+        ]
+
+        def send(chunk: tuple[int, list[BatchOp]]) -> list[BatchItemResult]:
+            return self._send_batch(chunk[0], chunk[1], idempotent=idempotent)
+
+        try:
+            if concurrency <= 1 or len(chunks) <= 1:
+                return [r for chunk in chunks for r in send(chunk)]
+
+            with ThreadPoolExecutor(max_workers=min(concurrency, len(chunks))) as pool:
+                return [r for results in pool.map(send, chunks) for r in results]
+        finally:
+            self._invalidate_ops(ops)
+
+    def _send_batch(
+        self, start: int, items: list[BatchOp], *, idempotent: bool
+    ) -> list[BatchItemResult]:
+        # Les paths du batch sont absolus côté serveur: /parse/classes/...
+        mount = urlsplit(self._http.base_url).path.rstrip("/")
+        requests = []
+        for method, path, body in items:
+            req: dict[str, Any] = {"method": method, "path": f"{mount}{path}"}
+            if body is not None:
+                req["body"] = body
+            requests.append(req)
+
+        try:
+            data = self._http.post("/batch", json={"requests": requests}, idempotent=idempotent)
+        except ConnectorError as e:
+            if isinstance(e, ApiError):
+                error = {"code": e.status_code, "error": e.message}
+            else:
+                error = {"code": 429 if isinstance(e, RateLimitError) else 0, "error": str(e)}
+            return [
+                BatchItemResult(index=start + i, success=None, error=error)
+                for i in range(len(items))
+            ]
+
+        out: list[BatchItemResult] = []
+        for i in range(len(items)):
+            item = data[i] if isinstance(data, list) and i < len(data) else {}
+            success = item.get("success")
+            error = None
+            if success is None:
+                error = item.get("error") or {"code": 0, "error": "Missing batch result"}
+            out.append(BatchItemResult(index=start + i, success=success, error=error))
+        return out
+
+    def _fetch_list(self, class_name: str, query_params: dict | None) -> list[dict]:
+        # Parse: GET /classes/<ClassName> (sans cache: pagination / scans)
+        data = self._http.get(f"/classes/{class_name}", params=query_params)
+        return _results(data)
+
+    # ----------------------------
+    # Cache
+    # ----------------------------
+    def _object_key(self, class_name: str, object_id: str, params: dict | None = None) -> str:
+        # Même préfixe pour toutes les projections d'un objet: invalidées ensemble
+        base = f"{self._cache_ns}obj:{class_name}:{object_id}:"
+        return base + json.dumps(params, sort_keys=True) if params else base
+
+    def _list_key(self, class_name: str, query_params: dict | None) -> str:
+        params = json.dumps(query_params or {}, sort_keys=True, separators=(",", ":"), default=str)
+        return f"{self._cache_ns}list:{class_name}:{params}"
+
+    def _cache_get(self, key: str) -> Any:
+        if self._cache is None:
+            return None
+        raw = self._cache.get(key)
+        # Décodé à chaque hit: l'appelant peut muter le résultat sans polluer le cache
+        return json.loads(raw) if raw is not None else None
+
+    def _cache_set(self, key: str, value: Any) -> None:
+        if self._cache is not None:
+            self._cache.set(key, json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+    def _invalidate(self, class_name: str, object_id: str | None = None) -> None:
+        if self._cache is None:
+            return
+        if object_id is not None:
+            self._cache.delete_prefix(self._object_key(class_name, object_id))
+        self._cache.delete_prefix(f"{self._cache_ns}list:{class_name}:")
+
+    def _invalidate_ops(self, ops: list[BatchOp]) -> None:
+        if self._cache is None:
+            return
+        # Une seule invalidation des listes par classe, quel que soit le nombre d'opérations
+        targets: dict[str, set[str]] = {}
+        for _, path, _ in ops:
+            # /classes/<ClassName>[/<objectId>]
+            parts = path.strip("/").split("/")
+            object_ids = targets.setdefault(parts[1], set())
+            if len(parts) > 2:
+                object_ids.add(parts[2])
+        for class_name, object_ids in targets.items():
+            self._cache.delete_prefix(f"{self._cache_ns}list:{class_name}:")
+            for object_id in object_ids:
+                self._cache.delete_prefix(self._object_key(class_name, object_id))
+
+    def _pages(
+        self,
+        class_name: str,
+        where: dict | None,
+        page_size: int,
+        order: str | None,
+        extra: dict[str, Any],
+        stream: bool,
+    ) -> Iterator[Any]:
+        if order is None and _keyset_compatible(where):
+            return self._pages_keyset(class_name, where, page_size, extra, stream)
+        if order == "createdAt" and _keyset_compatible(where, "createdAt"):
+            return self._pages_created_at(class_name, where, page_size, extra, stream)
+        return self._pages_skip(class_name, where, page_size, order, extra, stream)
+
+    def _fetch_page(self, class_name: str, params: dict, stream: bool) -> Any:
+        if stream:
+            rows = self._http.get(f"/classes/{class_name}", params=params, stream=True)
+            return _PageStream(rows)
+        return self._fetch_list(class_name, params)
+
+    def _pages_keyset(
+        self,
+        class_name: str,
+        where: dict | None,
+        page_size: int,
+        extra: dict[str, Any],
+        stream: bool = False,
+    ) -> Iterator[Any]:
+        last_id: Optional[str] = None
+        while True:
+            page_where = _after_object_id(where, last_id)
+            params: dict[str, Any] = {**extra, "limit": page_size, "order": "objectId"}
+            if page_where:
+                params["where"] = json.dumps(page_where)
+
+            page = self._fetch_page(class_name, params, stream)
+            yield page
+
+            # Page stream: compteurs valides une fois la page consommée par l'appelant
+            count, last = _page_stats(page)
+            if count < page_size:
+                return
+            last_id = last["objectId"]
+
+    def _pages_created_at(
+        self,
+        class_name: str,
+        where: dict | None,
+        page_size: int,
+        extra: dict[str, Any],
+        stream: bool = False,
+    ) -> Iterator[Any]:
+        # Keyset sur (createdAt, objectId): objectId départage les lignes de même createdAt
+        last: Optional[dict] = None
+        while True:
+            page_where = _after_created_at(where, last)
+            params: dict[str, Any] = {**extra, "limit": page_size, "order": "createdAt,objectId"}
+            if page_where:
+                params["where"] = json.dumps(page_where)
+
+            page = self._fetch_page(class_name, params, stream)
+            yield page
+
+            count, last = _page_stats(page)
+            if count < page_size:
+                return
+
+    def _pages_skip(
+        self,
+        class_name: str,
+        where: dict | None,
+        page_size: int,
+        order: str | None,
+        extra: dict[str, Any],
+        stream: bool = False,
+    ) -> Iterator[Any]:
+        skip = 0
+        while True:
+            params: dict[str, Any] = {**extra, "limit": page_size, "skip": skip}
+            if where:
+                params["where"] = json.dumps(where)
+            if order:
+                params["order"] = order
+
+            page = self._fetch_page(class_name, params, stream)
+            yield page
+
+            count, _ = _page_stats(page)
+            if count < page_size:
+                return
+            skip += count
+
+
+class _PageStream:
+    """Itérateur de lignes qui retient combien il en a rendu et la dernière."""
+
+    def __init__(self, rows: Iterator[dict]) -> None:
+        self._rows = rows
+        self.count = 0
+        self.last: Optional[dict] = None
+
+    def __iter__(self) -> "_PageStream":
+        return self
+
+    def __next__(self) -> dict:
+        row = next(self._rows)
+        self.count += 1
+        self.last = row
+        return row
+
+
+def _page_stats(page: Any) -> tuple[int, Optional[dict]]:
+    if isinstance(page, _PageStream):
+        return page.count, page.last
+    return len(page), (page[-1] if page else None)
+
+
+def _query_params(
+    base: dict | None,
+    *,
+    where: dict | None = None,
+    keys: Sequence[str] | None = None,
+    include: Sequence[str] | None = None,
+    order: str | None = None,
+    limit: int | None = None,
+    skip: int | None = None,
+) -> dict[str, Any]:
+    params: dict[str, Any] = dict(base or {})
+    if where:
+        params["where"] = json.dumps(where, separators=(",", ":"))
+    if keys:
+        params["keys"] = ",".join(keys)
+    if include:
+        params["include"] = ",".join(include)
+    if order:
+        params["order"] = order
+    if limit is not None:
+        params["limit"] = limit
+    if skip is not None:
+        params["skip"] = skip
+    return params
+
+
+def _results(data: Any) -> list[dict]:
+    # Parse retourne souvent {"results": [...]}
+    if isinstance(data, dict) and "results" in data:
+        return data["results"] or []
+    return data if isinstance(data, list) else []
+
+
+def _keyset_compatible(where: dict | None, field: str = "objectId") -> bool:
+    cond = (where or {}).get(field)
+    return cond is None or (isinstance(cond, dict) and "__type" not in cond)
+
+
+def _after_object_id(where: dict | None, last_id: str | None) -> dict:
+    page_where = dict(where or {})
+    if last_id is None:
+        return page_where
+
+    cond = dict(page_where.get("objectId") or {})
+    # Garde la contrainte la plus stricte si l'appelant a déjà un $gt
+    prev = cond.get("$gt")
+    cond["$gt"] = last_id if prev is None or last_id > prev else prev
+    page_where["objectId"] = cond
+    return page_where
+
+
+def _after_created_at(where: dict | None, last: dict | None) -> dict:
+    page_where = dict(where or {})
+    if last is None:
+        return page_where
+
+    created_at = last["createdAt"]
+    if not isinstance(created_at, dict):
+        created_at = {"__type": "Date", "iso": created_at}
+    after = [
+        {"createdAt": {"$gt": created_at}},
+        {"createdAt": created_at, "objectId": {"$gt": last["objectId"]}},
+    ]
+    if "$or" in page_where:  # ne pas écraser le $or de l'appelant
+        return {"$and": [page_where, {"$or": after}]}
+    page_where["$or"] = after
+    return page_where
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Literal, Optional, Sequence
+
+from .where import _encode
+
+if TYPE_CHECKING:
+    from .query import QueryApi
+
+ShardBy = Literal["createdAt", "objectId"]
+
+# Alphabet des objectId Parse, dans l'ordre de tri des chaînes
+_OBJECT_ID_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+_DONE = object()
+
+
+@dataclass(frozen=True)
+class ScanProgress:
+    shard: int
+    shard_rows: int
+    total_rows: int
+    shards_done: int
+    shards_total: int
+
+
+class _ShardFailed:
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+class ClassScanner:
+    """
+    Scan parallèle d'une classe Parse, découpée en shards (plages createdAt
+    ou préfixes d'objectId), chaque shard paginé en keyset via `QueryApi.iter_pages`.
+    - concurrency: nb de shards lus en même temps (threads: c'est de l'I/O,
+      garder `ApiClient(pool_maxsize=...)` >= concurrency pour réutiliser les sockets)
+    - ordered=True: lignes rendues triées sur la clé de shard (shards dans l'ordre des
+      plages; by="createdAt": chaque shard paginé en keyset sur (createdAt, objectId)),
+      sinon au fil de l'eau, sans ordre garanti
+    - buffer_pages: pages en attente par shard (borne la mémoire)
+    - on_progress: appelé dans le thread consommateur après chaque page rendue
+    """
+
+    def __init__(
+        self,
+        query: "QueryApi",
+        *,
+        shards: int = 8,
+        concurrency: int = 4,
+        by: ShardBy = "createdAt",
+        ordered: bool = False,
+        page_size: int = 1000,
+        buffer_pages: int = 4,
+        on_progress: Optional[Callable[[ScanProgress], None]] = None,
+        keys: Sequence[str] | None = None,
+        include: Sequence[str] | None = None,
+    ) -> None:
+        self.query = query
+        self.shards = max(1, shards)
+        self.concurrency = max(1, concurrency)
+        self.by = by
+        self.ordered = ordered
+        self.page_size = page_size
+        self.buffer_pages = max(1, buffer_pages)
+        self.on_progress = on_progress
+        self.keys = keys
+        self.include = include
+
+    def scan(self, class_name: str, where: dict | None = None) -> Iterator[dict]:
+        if not isinstance((where or {}).get(self.by, {}), dict):
+            # where fixe déjà une valeur exacte: rien à découper
+            yield from self.query.iter_class(
+                class_name, where, page_size=self.page_size, keys=self.keys, include=self.include
+            )
+            return
+
+        if self.by == "objectId":
+            shard_wheres = _object_id_shards(where, self.shards)
+        else:
+            shard_wheres = self._created_at_shards(class_name, where)
+        if not shard_wheres:
+            return
+
+        # by="objectId": la pagination keyset par défaut suit déjà l'ordre des objectId
+        order = "createdAt" if self.ordered and self.by == "createdAt" else None
+        stop = threading.Event()
+        n = len(shard_wheres)
+        shared: queue.Queue = queue.Queue(maxsize=self.buffer_pages * self.concurrency)
+        queues = [queue.Queue(maxsize=self.buffer_pages) for _ in range(n)] if self.ordered else []
+
+        def put(q: queue.Queue, item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    q.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def run(index: int) -> None:
+            q = queues[index] if self.ordered else shared
+            try:
+                for page in self.query.iter_pages(
+                    class_name,
+                    shard_wheres[index],
+                    page_size=self.page_size,
+                    order=order,
+                    keys=self.keys,
+                    include=self.include,
+                ):
+                    if not put(q, (index, page)):
+                        return
+                put(q, (index, _DONE))
+            except BaseException as e:  # remonté au consommateur
+                put(q, (index, _ShardFailed(e)))
+
+        pool = ThreadPoolExecutor(max_workers=min(self.concurrency, n))
+        try:
+            for i in range(n):
+                pool.submit(run, i)
+
+            shard_rows = [0] * n
+            total = 0
+            done = 0
+            pending = [queues[i] for i in range(n)] if self.ordered else [shared] * n
+            current = 0
+            while done < n:
+                index, item = pending[current].get()
+                if item is _DONE:
+                    done += 1
+                    if self.ordered:
+                        current += 1
+                    continue
+                if isinstance(item, _ShardFailed):
+                    raise item.error
+
+                yield from item
+                shard_rows[index] += len(item)
+                total += len(item)
+                if self.on_progress is not None:
+                    self.on_progress(ScanProgress(index, shard_rows[index], total, done, n))
+        finally:
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _created_at_shards(self, class_name: str, where: dict | None) -> list[dict]:
+        bounds = self._created_at_bounds(class_name, where)
+        if bounds is None:
+            return []
+        first, last = bounds
+        # borne haute exclusive: +1 ms pour inclure la dernière ligne
+        last = last + timedelta(milliseconds=1)
+        step = (last - first) / self.shards
+        if step <= timedelta(0):
+            return [dict(where or {})]
+
+        edges = [first + step * i for i in range(self.shards)] + [last]
+        out = []
+        for lo, hi in zip(edges, edges[1:]):
+            if hi <= lo:
+                continue
+            shard = dict(where or {})
+            cond = dict(shard.get("createdAt") or {})
+            cond["$gte"] = _encode(lo)
+            cond["$lt"] = _encode(hi)
+            shard["createdAt"] = cond
+            out.append(shard)
+        return out
+
+    def _created_at_bounds(
+        self, class_name: str, where: dict | None
+    ) -> Optional[tuple[datetime, datetime]]:
+        found = []
+        for order in ("createdAt", "-createdAt"):
+            params: dict[str, Any] = {"order": order, "limit": 1, "keys": "createdAt"}
+            if where:
+                params["where"] = json.dumps(where)
+            rows = self.query._fetch_list(class_name, params)
+            if not rows:
+                return None
+            found.append(_from_iso(rows[0]["createdAt"]))
+        return found[0], found[1]
+
+
+def _object_id_shards(where: dict | None, shards: int) -> list[dict]:
+    base = (where or {}).get("objectId")
+    if base is not None and not isinstance(base, dict):
+        return [dict(where or {})]  # objectId exact: un seul shard
+
+    alphabet = _OBJECT_ID_ALPHABET
+    shards = min(shards, len(alphabet))
+    size = len(alphabet) / shards
+    starts = [alphabet[round(i * size)] for i in range(shards)]
+
+    out = []
+    for i, lo in enumerate(starts):
+        shard = dict(where or {})
+        cond = dict(base or {})
+        # Plage du shard intersectée avec les bornes de l'appelant (jamais écrasées)
+        if i > 0:
+            cond["$gte"] = max(cond.get("$gte", lo), lo)
+        if i + 1 < shards:
+            hi = starts[i + 1]
+            cond["$lt"] = min(cond.get("$lt", hi), hi)
+        if _empty_range(cond):
+            continue
+        if cond:
+            shard["objectId"] = cond
+        out.append(shard)
+    return out
+
+
+def _empty_range(cond: dict) -> bool:
+    # (valeur, stricte): borne basse la plus haute, borne haute la plus basse
+    lows = [(cond[op], op == "$gt") for op in ("$gte", "$gt") if op in cond]
+    highs = [(cond[op], op == "$lt") for op in ("$lte", "$lt") if op in cond]
+    if not lows or not highs:
+        return False
+    low, low_strict = max(lows)
+    high, high_strict = min(highs, key=lambda bound: (bound[0], not bound[1]))
+    return low > high or (low == high and (low_strict or high_strict))
+
+
+def _from_iso(value: Any) -> datetime:
+    if isinstance(value, dict):  # {"__type": "Date", "iso": ...}
+        value = value.get("iso")
+    return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
@@ -1,6 +1,13 @@
-from typing import TypedDict
+from typing import Any, Optional, TypedDict
 
 class ParseCredential(TypedDict):
     base_url: str
     app_id: str
     master_key: str
+
+
+class BatchItemResult(TypedDict):
+    """Résultat d'une opération d'un batch Parse (même index que l'entrée)."""
+    index: int
+    success: Optional[dict[str, Any]]
+    error: Optional[dict[str, Any]]  # {"code": ..., "error": "..."}
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+
+class Where(dict):
+    """
+    Petit builder de clause `where` Parse. C'est un dict: utilisable partout
+    où un where est accepté (list_class, iter_class, count, scan_class...).
+
+        Where(status="active").gte("score", 10).in_("tag", ["a", "b"]).exists("email")
+    """
+
+    def __init__(self, **equals: Any) -> None:
+        super().__init__()
+        for field, value in equals.items():
+            self.eq(field, value)
+
+    def eq(self, field: str, value: Any) -> "Where":
+        self[field] = _encode(value)
+        return self
+
+    def ne(self, field: str, value: Any) -> "Where":
+        return self._op(field, "$ne", value)
+
+    def gt(self, field: str, value: Any) -> "Where":
+        return self._op(field, "$gt", value)
+
+    def gte(self, field: str, value: Any) -> "Where":
+        return self._op(field, "$gte", value)
+
+    def lt(self, field: str, value: Any) -> "Where":
+        return self._op(field, "$lt", value)
+
+    def lte(self, field: str, value: Any) -> "Where":
+        return self._op(field, "$lte", value)
+
+    def in_(self, field: str, values: Iterable[Any]) -> "Where":
+        return self._op(field, "$in", [_encode(v) for v in values])
+
+    def nin(self, field: str, values: Iterable[Any]) -> "Where":
+        return self._op(field, "$nin", [_encode(v) for v in values])
+
+    def exists(self, field: str, exists: bool = True) -> "Where":
+        return self._op(field, "$exists", exists)
+
+    def regex(self, field: str, pattern: str, options: str = "") -> "Where":
+        self._op(field, "$regex", pattern)
+        if options:
+            self._op(field, "$options", options)
+        return self
+
+    def pointer(self, field: str, class_name: str, object_id: str) -> "Where":
+        return self.eq(field, pointer(class_name, object_id))
+
+    def _op(self, field: str, op: str, value: Any) -> "Where":
+        cond = self.get(field)
+        if not isinstance(cond, dict) or "__type" in cond:
+            cond = {}
+        cond[op] = _encode(value)
+        self[field] = cond
+        return self
+
+
+def pointer(class_name: str, object_id: str) -> dict[str, str]:
+    return {"__type": "Pointer", "className": class_name, "objectId": object_id}
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        iso = value.astimezone(timezone.utc).isoformat(timespec="milliseconds")
+        return {"__type": "Date", "iso": iso.replace("+00:00", "Z")}
+    return value
@@ -4,10 +4,17 @@ from .exceptions import (
     ConnectorError,
     ApiError,
     RateLimitError,
+    CircuitOpenError,
 )
 from .config import Settings
 from .logging import get_logger
 from .api_client import ApiClient
+from .async_api_client import AsyncApiClient
+from .retry import RetryPolicy, RetryAttempt
+from .rate_limit import RateLimiter, TokenBucket, SqliteTokenBucket
+from .circuit_breaker import CircuitBreaker, CircuitState
+from .cache import CacheStats, MemoryCache, SqliteCache, TieredCache
+from .audio_cache import AudioCache, CachedAudio
 
 __all__ = [
     "OptimationError",
@@ -15,7 +22,22 @@ __all__ = [
     "ConnectorError",
     "ApiError",
     "RateLimitError",
+    "CircuitOpenError",
     "Settings",
     "get_logger",
     "ApiClient",
+    "AsyncApiClient",
+    "RetryPolicy",
+    "RetryAttempt",
+    "RateLimiter",
+    "TokenBucket",
+    "SqliteTokenBucket",
+    "CircuitBreaker",
+    "CircuitState",
+    "CacheStats",
+    "MemoryCache",
+    "SqliteCache",
+    "TieredCache",
+    "AudioCache",
+    "CachedAudio",
 ]
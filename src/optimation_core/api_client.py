@@ -2,17 +2,86 @@ from __future__ import annotations
 
 import time
 import logging
-from typing import Any, Mapping, Optional
+from typing import Any, Iterator, Mapping, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from .exceptions import ApiError, RateLimitError
+from .json_stream import iter_json_array
+from .circuit_breaker import CircuitBreaker, is_breaker_failure
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy, parse_retry_after
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _handle_response(resp: Any, url: str) -> Any:
+    """
+    Mapping commun réponse HTTP -> résultat / exception.
+    Marche avec `requests.Response` et `httpx.Response` (même surface).
+    """
+    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+
+    if resp.status_code == 429:
+        raise RateLimitError(f"Rate limit (429) on {url}", retry_after=retry_after)
+
+    if not (200 <= resp.status_code < 300):
+        msg = ""
+        try:
+            payload = resp.json()
+            msg = payload.get("error") or payload.get("message") or str(payload)
+        except Exception:
+            msg = resp.text.strip()
+        raise ApiError(
+            status_code=resp.status_code,
+            message=msg[:1000],
+            url=str(resp.url),
+            details={"retry_after": retry_after} if retry_after is not None else None,
+        )
+
+    # Parse JSON si possible, sinon texte
+    ctype = (resp.headers.get("Content-Type") or "").lower()
+    if resp.status_code == 204:
+        return None
+    if "application/json" in ctype:
+        return resp.json()
+    return resp.text
+
+
+def _stream_items(resp: requests.Response) -> Iterator[Any]:
+    # Éléments de {"results": [...]} (ou d'un tableau racine) au fil de la lecture
+    try:
+        if resp.status_code != 204:
+            yield from iter_json_array(resp.iter_content(chunk_size=STREAM_CHUNK_SIZE))
+    finally:
+        resp.close()
+
+
+def _is_retryable(
+    policy: RetryPolicy, method: str, error: BaseException, idempotent: Optional[bool]
+) -> bool:
+    if isinstance(error, RateLimitError):
+        status = 429
+    elif isinstance(error, ApiError):
+        status = error.status_code
+    else:
+        return False
+    return policy.is_retryable(method, status, idempotent=idempotent)
+
+
+def _retry_after(error: BaseException) -> Optional[float]:
+    if isinstance(error, RateLimitError):
+        return error.retry_after
+    if isinstance(error, ApiError) and error.details:
+        return error.details.get("retry_after")
+    return None
 
 
 class ApiClient:
     """
     Client REST standard Optimation (timeouts + erreurs + logging).
-    Retry: tu peux l'ajouter plus tard. Commence simple.
+    Retry optionnel via `retry=RetryPolicy(...)` (aucun retry par défaut).
     """
 
     def __init__(
@@ -22,51 +91,106 @@ class ApiClient:
         headers: Optional[Mapping[str, str]] = None,
         timeout_s: float = 15.0,
         logger: Optional[logging.Logger] = None,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        pool_maxsize: int = 10,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.timeout_s = timeout_s
         self.log = logger or logging.getLogger("optimation.http")
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        # Ex: CircuitBreaker.for_host(base_url) pour partager l'état entre clients
+        self.circuit_breaker = circuit_breaker
 
         self.session = requests.Session()
+        # Connexions keep-alive réutilisables par hôte: >= nb de threads concurrents
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         if headers:
             self.session.headers.update(dict(headers))
 
     def _url(self, path: str) -> str:
         return f"{self.base_url}/{path.lstrip('/')}"
 
-    def request(self, method: str, path: str, **kwargs: Any) -> Any:
+    def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        idempotent: Optional[bool] = None,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        `idempotent` force la décision de retry (ex: POST Parse idempotent côté métier).
+        Par défaut: GET/HEAD/OPTIONS/PUT/DELETE le sont, POST/PATCH non.
+        `stream=True`: renvoie un itérateur sur les éléments de `results` décodés au fil
+        de l'eau (le body complet n'est jamais en mémoire). À consommer jusqu'au bout
+        (ou fermer) pour rendre la connexion au pool.
+        """
         url = self._url(path)
         timeout = kwargs.pop("timeout", self.timeout_s)
 
-        t0 = time.perf_counter()
+        if self.retry is None:
+            return self._send(method, url, timeout, kwargs, stream)
+
+        policy = self.retry
+        return policy.call(
+            lambda: self._send(method, url, timeout, kwargs, stream),
+            retry_if=lambda e: _is_retryable(policy, method, e, idempotent),
+            retry_after=_retry_after,
+            label=f"{method.upper()} {url}",
+            log=self.log,
+        )
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        timeout: Any,
+        kwargs: Mapping[str, Any],
+        stream: bool = False,
+    ) -> Any:
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            breaker.before_call()  # CircuitOpenError: pas d'appel réseau
+
         try:
-            resp = self.session.request(method, url, timeout=timeout, **kwargs)
-        except requests.RequestException as e:
-            raise ApiError(status_code=0, message=str(e), url=url) from e
-        finally:
-            dt_ms = (time.perf_counter() - t0) * 1000
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+
+            t0 = time.perf_counter()
+            try:
+                resp = self.session.request(
+                    method, url, timeout=timeout, stream=stream, **kwargs
+                )
+            except requests.RequestException as e:
+                raise ApiError(status_code=0, message=str(e), url=url) from e
+            finally:
+                dt_ms = (time.perf_counter() - t0) * 1000
+        except ApiError:
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
 
         self.log.info("%s %s -> %s (%.0fms)", method.upper(), url, resp.status_code, dt_ms)
 
-        if resp.status_code == 429:
-            raise RateLimitError(f"Rate limit (429) on {url}")
+        if breaker is not None:
+            if is_breaker_failure(resp.status_code):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
 
-        if not (200 <= resp.status_code < 300):
-            msg = ""
-            try:
-                payload = resp.json()
-                msg = payload.get("error") or payload.get("message") or str(payload)
-            except Exception:
-                msg = resp.text.strip()
-            raise ApiError(status_code=resp.status_code, message=msg[:1000], url=resp.url)
-
-        # Parse JSON si possible, sinon texte
-        ctype = (resp.headers.get("Content-Type") or "").lower()
-        if resp.status_code == 204:
-            return None
-        if "application/json" in ctype:
-            return resp.json()
-        return resp.text
+        if stream and 200 <= resp.status_code < 300:
+            return _stream_items(resp)
+        return _handle_response(resp, url)
 
     def get(self, path: str, *, params: Optional[Mapping[str, Any]] = None, **kw: Any) -> Any:
         return self.request("GET", path, params=params, **kw)
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import time
+import logging
+from typing import Any, AsyncIterator, Mapping, Optional
+
+import httpx
+
+from .api_client import _handle_response, _is_retryable, _retry_after
+from .exceptions import ApiError
+from .json_stream import JsonArrayStream
+from .circuit_breaker import CircuitBreaker, is_breaker_failure
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
+
+
+class AsyncApiClient:
+    """
+    Jumeau async de `ApiClient` (même surface, mêmes erreurs, mêmes logs).
+    Un seul `httpx.AsyncClient` par instance: pool keep-alive borné,
+    donc des centaines de requêtes en vol partagent quelques sockets.
+    À fermer avec `await client.aclose()` (ou `async with`).
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        *,
+        headers: Optional[Mapping[str, str]] = None,
+        timeout_s: float = 15.0,
+        logger: Optional[logging.Logger] = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry_s: float = 30.0,
+        retry: Optional[RetryPolicy] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.timeout_s = timeout_s
+        self.log = logger or logging.getLogger("optimation.http")
+        self.retry = retry
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+
+        self.session = httpx.AsyncClient(
+            headers=dict(headers) if headers else None,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry_s,
+            ),
+            # Les requêtes en attente d'une connexion libre ne doivent pas
+            # consommer le timeout réseau: on borne seulement connect/read/write.
+            timeout=httpx.Timeout(timeout_s, pool=None),
+        )
+
+    async def __aenter__(self) -> "AsyncApiClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        await self.session.aclose()
+
+    def _url(self, path: str) -> str:
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        idempotent: Optional[bool] = None,
+        stream: bool = False,
+        **kwargs: Any,
+    ) -> Any:
+        """`stream=True`: renvoie un itérateur async sur les éléments de `results`."""
+        url = self._url(path)
+        timeout = kwargs.pop("timeout", self.timeout_s)
+
+        if self.retry is None:
+            return await self._send(method, url, timeout, kwargs, stream)
+
+        policy = self.retry
+        return await policy.acall(
+            lambda: self._send(method, url, timeout, kwargs, stream),
+            retry_if=lambda e: _is_retryable(policy, method, e, idempotent),
+            retry_after=_retry_after,
+            label=f"{method.upper()} {url}",
+            log=self.log,
+        )
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        timeout: Any,
+        kwargs: Mapping[str, Any],
+        stream: bool = False,
+    ) -> Any:
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            breaker.before_call()
+
+        try:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.aacquire()
+
+            t0 = time.perf_counter()
+            try:
+                req = self.session.build_request(
+                    method, url, timeout=_request_timeout(timeout), **kwargs
+                )
+                resp = await self.session.send(req, stream=stream)
+            except httpx.HTTPError as e:
+                raise ApiError(status_code=0, message=str(e), url=url) from e
+            finally:
+                dt_ms = (time.perf_counter() - t0) * 1000
+        except ApiError:
+            if breaker is not None:
+                breaker.record_failure()
+            raise
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+
+        self.log.info("%s %s -> %s (%.0fms)", method.upper(), url, resp.status_code, dt_ms)
+
+        if breaker is not None:
+            if is_breaker_failure(resp.status_code):
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+
+        if stream:
+            if 200 <= resp.status_code < 300:
+                return _aiter_items(resp)
+            await resp.aread()
+            await resp.aclose()
+        return _handle_response(resp, url)
+
+    async def get(self, path: str, *, params: Optional[Mapping[str, Any]] = None, **kw: Any) -> Any:
+        return await self.request("GET", path, params=params, **kw)
+
+    async def post(self, path: str, *, json: Any = None, data: Any = None, **kw: Any) -> Any:
+        return await self.request("POST", path, json=json, data=data, **kw)
+
+    async def put(self, path: str, *, json: Any = None, data: Any = None, **kw: Any) -> Any:
+        return await self.request("PUT", path, json=json, data=data, **kw)
+
+    async def patch(self, path: str, *, json: Any = None, data: Any = None, **kw: Any) -> Any:
+        return await self.request("PATCH", path, json=json, data=data, **kw)
+
+    async def delete(
+        self, path: str, *, params: Optional[Mapping[str, Any]] = None, **kw: Any
+    ) -> Any:
+        return await self.request("DELETE", path, params=params, **kw)
+
+
+async def _aiter_items(resp: httpx.Response) -> AsyncIterator[Any]:
+    parser = JsonArrayStream()
+    try:
+        if resp.status_code == 204:
+            return
+        async for chunk in resp.aiter_bytes():
+            for item in parser.feed(chunk):
+                yield item
+        for item in parser.close():
+            yield item
+    finally:
+        await resp.aclose()
+
+
+def _request_timeout(timeout: Any) -> httpx.Timeout:
+    # Pas de timeout "pool": l'attente d'une connexion libre ne consomme pas le budget réseau
+    if isinstance(timeout, httpx.Timeout):
+        return httpx.Timeout(
+            connect=timeout.connect, read=timeout.read, write=timeout.write, pool=None
+        )
+    return httpx.Timeout(timeout, pool=None)
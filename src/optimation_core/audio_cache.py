@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from .cache import CacheStats, default_cache_dir
+from .sqlite import SqliteConnections
+
+
+class CachedAudio:
+    """
+    Audio servi depuis le cache: fichier mappé en mémoire (mmap), sans copie.
+    `data` reste valide tant que l'objet est ouvert; `path` se prête à sendfile /
+    FileResponse. Un blob évincé pendant la lecture reste lisible (POSIX).
+
+        with cache.open(key) as audio:
+            sock.sendall(audio.data)
+    """
+
+    def __init__(self, path: Path, mime_type: str, size: int) -> None:
+        self.path = path
+        self.mime_type = mime_type
+        self.size = size
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = memoryview(self._mmap)
+
+    def chunks(self, chunk_size: int = 64 * 1024) -> Iterator[memoryview]:
+        for start in range(0, self.size, chunk_size):
+            yield self.data[start:start + chunk_size]
+
+    def close(self) -> None:
+        self.data.release()
+        self._mmap.close()
+
+    def __enter__(self) -> "CachedAudio":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class AudioCache:
+    """
+    Cache d'audio synthétisé partagé entre connecteurs TTS (et entre process).
+    - clé: hash du contenu de la requête (fournisseur, modèle, voix, langue, prompt, texte,
+      format), voir `AudioCache.key`
+    - blobs: un fichier par clé sous `directory/blobs/` (écriture atomique)
+    - index SQLite: taille, type MIME, dernier accès -> éviction LRU au-delà de max_bytes;
+      taille totale tenue par triggers (ligne `meta`), pas de SUM à chaque écriture
+    - remplacement d'un blob et éviction sous le verrou d'écriture SQLite: un process
+      ne supprime jamais un blob qu'un autre vient de réécrire
+    - touch_interval_s: un hit ne réécrit la date d'accès que si elle est plus ancienne
+    - lecture: `get` (bytes) ou `open` (mmap, pour servir sans copie)
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike[str] | None = None,
+        *,
+        max_bytes: int = 2 * 1024 * 1024 * 1024,
+        busy_timeout_s: float = 5.0,
+        touch_interval_s: float = 60.0,
+    ) -> None:
+        self.directory = Path(directory) if directory else default_cache_dir() / "audio"
+        self.max_bytes = max_bytes
+        self.busy_timeout_s = busy_timeout_s
+        self.touch_interval_s = touch_interval_s
+        self.stats = CacheStats()
+        self._blobs = self.directory / "blobs"
+        self._db = SqliteConnections(
+            self.directory / "index.sqlite3", busy_timeout_s=busy_timeout_s
+        )
+
+        self._blobs.mkdir(parents=True, exist_ok=True)
+        with self._db.immediate() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS audio ("
+                " key TEXT PRIMARY KEY, mime_type TEXT NOT NULL, size INTEGER NOT NULL,"
+                " created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS audio_accessed ON audio (accessed)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO meta (name, value) "
+                "SELECT 'size', COALESCE(SUM(size), 0) FROM audio"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS audio_size_insert AFTER INSERT ON audio BEGIN"
+                " UPDATE meta SET value = value + new.size WHERE name = 'size'; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS audio_size_delete AFTER DELETE ON audio BEGIN"
+                " UPDATE meta SET value = value - old.size WHERE name = 'size'; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS audio_size_update AFTER UPDATE OF size ON audio"
+                " BEGIN UPDATE meta SET value = value + new.size - old.size"
+                " WHERE name = 'size'; END"
+            )
+
+    @staticmethod
+    def key(**fields: Any) -> str:
+        """Clé déterministe: sha256 du JSON trié des champs (None inclus)."""
+        payload = json.dumps(fields, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _conn(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def _path(self, key: str) -> Path:
+        return self._blobs / key[:2] / key
+
+    def _lookup(self, key: str) -> Optional[tuple[Path, str, int]]:
+        conn = self._conn()
+        row = conn.execute(
+            "SELECT mime_type, size, accessed FROM audio WHERE key = ?", (key,)
+        ).fetchone()
+        path = self._path(key)
+        if row is None or not path.is_file():
+            if row is not None:  # blob supprimé à la main: entrée orpheline
+                conn.execute("DELETE FROM audio WHERE key = ?", (key,))
+            self.stats.misses += 1
+            return None
+        now = time.time()
+        if now - row[2] >= self.touch_interval_s:
+            conn.execute("UPDATE audio SET accessed = ? WHERE key = ?", (now, key))
+        self.stats.hits += 1
+        return path, row[0], row[1]
+
+    def get(self, key: str) -> Optional[tuple[bytes, str]]:
+        """(audio, type MIME) ou None."""
+        found = self._lookup(key)
+        if found is None:
+            return None
+        path, mime_type, _ = found
+        try:
+            return path.read_bytes(), mime_type
+        except FileNotFoundError:  # évincé entre-temps par un autre process
+            return None
+
+    def open(self, key: str) -> Optional[CachedAudio]:
+        """Audio mappé en mémoire (à fermer, ou `with`), ou None."""
+        found = self._lookup(key)
+        if found is None:
+            return None
+        try:
+            return CachedAudio(*found)
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, data: bytes, mime_type: str) -> None:
+        if not data or len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        # Écriture atomique: un lecteur ne voit jamais un blob partiel
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            now = time.time()
+            # Blob publié et indexé sous le même verrou que l'éviction
+            with self._db.immediate() as conn:
+                os.replace(tmp, path)
+                conn.execute(
+                    "INSERT INTO audio (key, mime_type, size, created, accessed)"
+                    " VALUES (?, ?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET"
+                    " mime_type = excluded.mime_type, size = excluded.size,"
+                    " created = excluded.created, accessed = excluded.accessed",
+                    (key, mime_type, len(data), now, now),
+                )
+                self.stats.sets += 1
+                self._evict(conn)
+        finally:
+            Path(tmp).unlink(missing_ok=True)
+
+    def delete(self, key: str) -> None:
+        with self._db.immediate() as conn:
+            conn.execute("DELETE FROM audio WHERE key = ?", (key,))
+            self._path(key).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        for (key,) in self._conn().execute("SELECT key FROM audio").fetchall():
+            self.delete(key)
+
+    @property
+    def size_bytes(self) -> int:
+        row = self._conn().execute("SELECT value FROM meta WHERE name = 'size'").fetchone()
+        return int(row[0]) if row is not None else 0
+
+    def __len__(self) -> int:
+        return int(self._conn().execute("SELECT COUNT(*) FROM audio").fetchone()[0])
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Appelé dans la transaction de set(): lignes et blobs supprimés ensemble
+        total = self.size_bytes
+        while total > self.max_bytes:
+            rows = conn.execute(
+                "SELECT key, size FROM audio ORDER BY accessed LIMIT 64"
+            ).fetchall()
+            if not rows:
+                return
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM audio WHERE key = ?", (key,))
+                self._path(key).unlink(missing_ok=True)
+                total -= size
+                self.stats.evictions += 1
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import os
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .sqlite import SqliteConnections
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class MemoryCache:
+    """
+    Cache LRU en mémoire, valeurs `bytes`, thread-safe.
+    - max_bytes: taille totale des valeurs (éviction LRU au-delà)
+    - max_entries: nb max d'entrées (optionnel)
+    - ttl_s: durée de vie par défaut (None = pas d'expiration)
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entries: Optional[int] = None,
+        ttl_s: Optional[float] = None,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self.stats = CacheStats()
+        self._data: OrderedDict[str, tuple[bytes, Optional[float]]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                self._pop(key)
+                self.stats.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.stats.hits += 1
+            return value
+
+    def set(self, key: str, value: bytes, ttl_s: Optional[float] = None) -> None:
+        if len(value) > self.max_bytes:
+            return  # trop gros pour ce tier
+        ttl = self.ttl_s if ttl_s is None else ttl_s
+        expires = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+            self._data[key] = (value, expires)
+            self._size += len(value)
+            self.stats.sets += 1
+            while self._size > self.max_bytes or (
+                self.max_entries is not None and len(self._data) > self.max_entries
+            ):
+                oldest = next(iter(self._data))
+                self._pop(oldest)
+                self.stats.evictions += 1
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._data:
+                self._pop(key)
+
+    def delete_prefix(self, prefix: str) -> None:
+        with self._lock:
+            for key in [k for k in self._data if k.startswith(prefix)]:
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._size = 0
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def _pop(self, key: str) -> None:
+        value, _ = self._data.pop(key)
+        self._size -= len(value)
+
+
+class SqliteCache:
+    """
+    Cache sur disque (SQLite), partagé entre process, valeurs `bytes`.
+    LRU approximatif par date de dernier accès, borne en octets, TTL.
+    - taille totale tenue à jour par triggers (ligne `meta`): pas de SUM à chaque écriture
+    - touch_interval_s: un hit ne réécrit la date d'accès que si elle a plus de
+      touch_interval_s secondes (lectures chaudes sans écriture)
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        *,
+        max_bytes: int = 512 * 1024 * 1024,
+        ttl_s: Optional[float] = None,
+        busy_timeout_s: float = 5.0,
+        touch_interval_s: float = 60.0,
+    ) -> None:
+        self.path = Path(path) if path else default_cache_dir() / "cache.sqlite3"
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self.busy_timeout_s = busy_timeout_s
+        self.touch_interval_s = touch_interval_s
+        self.stats = CacheStats()
+        self._db = SqliteConnections(self.path, busy_timeout_s=busy_timeout_s)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,"
+                " expires REAL, accessed REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)"
+            )
+            # Fichier existant (sans triggers): total initialisé une fois, même transaction
+            conn.execute(
+                "INSERT OR IGNORE INTO meta (name, value) "
+                "SELECT 'size', COALESCE(SUM(size), 0) FROM entries"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries BEGIN"
+                " UPDATE meta SET value = value + new.size WHERE name = 'size'; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries BEGIN"
+                " UPDATE meta SET value = value - old.size WHERE name = 'size'; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries"
+                " BEGIN UPDATE meta SET value = value + new.size - old.size"
+                " WHERE name = 'size'; END"
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _conn(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str) -> Optional[tuple[bytes, Optional[float]]]:
+        """(valeur, TTL restant en s ou None) — utile pour promouvoir vers un autre tier."""
+        conn = self._conn()
+        now = time.time()
+        row = conn.execute(
+            "SELECT value, expires, accessed FROM entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            self.stats.misses += 1
+            return None
+        value, expires, accessed = row
+        if expires is not None and expires <= now:
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.stats.misses += 1
+            return None
+        if now - accessed >= self.touch_interval_s:
+            conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+        self.stats.hits += 1
+        return bytes(value), (expires - now if expires is not None else None)
+
+    def set(self, key: str, value: bytes, ttl_s: Optional[float] = None) -> None:
+        if len(value) > self.max_bytes:
+            return
+        ttl = self.ttl_s if ttl_s is None else ttl_s
+        now = time.time()
+        expires = now + ttl if ttl is not None else None
+        conn = self._conn()
+        # Upsert (pas INSERT OR REPLACE: le DELETE implicite ne déclenche pas les triggers)
+        conn.execute(
+            "INSERT INTO entries (key, value, size, expires, accessed) VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, size = excluded.size,"
+            " expires = excluded.expires, accessed = excluded.accessed",
+            (key, sqlite3.Binary(value), len(value), expires, now),
+        )
+        self.stats.sets += 1
+        self._evict(conn, now)
+
+    def delete(self, key: str) -> None:
+        self._conn().execute("DELETE FROM entries WHERE key = ?", (key,))
+
+    def delete_prefix(self, prefix: str) -> None:
+        # Intervalle [prefix, prefix + U+10FFFF): utilise l'index de la clé primaire
+        self._conn().execute(
+            "DELETE FROM entries WHERE key >= ? AND key < ?", (prefix, prefix + "\U0010ffff")
+        )
+
+    def clear(self) -> None:
+        self._conn().execute("DELETE FROM entries")
+
+    @property
+    def size_bytes(self) -> int:
+        row = self._conn().execute("SELECT value FROM meta WHERE name = 'size'").fetchone()
+        return int(row[0]) if row is not None else 0
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        total = self.size_bytes
+        if total <= self.max_bytes:
+            return
+        # Budget dépassé: d'abord les entrées expirées (sinon supprimées à la lecture)
+        conn.execute("DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        total = self.size_bytes
+        while total > self.max_bytes:
+            rows = conn.execute(
+                "SELECT key, size FROM entries ORDER BY accessed LIMIT 64"
+            ).fetchall()
+            if not rows:
+                return
+            for key, size in rows:
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                self.stats.evictions += 1
+
+
+class TieredCache:
+    """Mémoire devant disque: lecture mémoire puis disque (promotion), écriture dans les deux."""
+
+    def __init__(self, memory: MemoryCache, disk: SqliteCache) -> None:
+        self.memory = memory
+        self.disk = disk
+
+    @property
+    def stats(self) -> CacheStats:
+        # hit = trouvé dans un des tiers; miss = absent des deux
+        return CacheStats(
+            hits=self.memory.stats.hits + self.disk.stats.hits,
+            misses=self.disk.stats.misses,
+            sets=self.memory.stats.sets,
+            evictions=self.memory.stats.evictions + self.disk.stats.evictions,
+        )
+
+    def get(self, key: str) -> Optional[bytes]:
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        entry = self.disk.get_entry(key)
+        if entry is None:
+            return None
+        value, remaining = entry
+        # Ne pas prolonger en mémoire une entrée qui expire bientôt sur disque
+        ttl = self.memory.ttl_s
+        if remaining is not None:
+            ttl = remaining if ttl is None else min(ttl, remaining)
+        self.memory.set(key, value, ttl)
+        return value
+
+    def set(self, key: str, value: bytes, ttl_s: Optional[float] = None) -> None:
+        self.memory.set(key, value, ttl_s)
+        self.disk.set(key, value, ttl_s)
+
+    def delete(self, key: str) -> None:
+        self.memory.delete(key)
+        self.disk.delete(key)
+
+    def delete_prefix(self, prefix: str) -> None:
+        self.memory.delete_prefix(prefix)
+        self.disk.delete_prefix(prefix)
+
+    def clear(self) -> None:
+        self.memory.clear()
+        self.disk.clear()
+
+
+Cache = MemoryCache | SqliteCache | TieredCache
+
+
+def default_cache_dir() -> Path:
+    base = os.getenv("OPTIMATION_CACHE_DIR") or os.path.join(Path.home(), ".cache", "optimation")
+    return Path(base)
@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import time
+import threading
+from collections import deque
+from enum import Enum
+from typing import Any
+from urllib.parse import urlsplit
+
+from .exceptions import CircuitOpenError
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker (closed / open / half-open) sur un taux d'échec glissant.
+    - closed: tout passe; on ouvre si >= `minimum_calls` appels dans `window_s`
+      et taux d'échec >= `failure_rate_threshold`
+    - open: échec immédiat (CircuitOpenError) pendant `open_duration_s`
+    - half-open: `half_open_max_calls` requêtes sondes; succès -> closed, échec -> open
+    Thread-safe. Partager une instance par hôte via `CircuitBreaker.for_host(url)`.
+    """
+
+    _registry: dict[str, "CircuitBreaker"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window_s: float = 30.0,
+        open_duration_s: float = 15.0,
+        half_open_max_calls: int = 1,
+    ) -> None:
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_s = window_s
+        self.open_duration_s = open_duration_s
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._outcomes: deque[tuple[float, bool]] = deque()  # (t, failed)
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+
+    @classmethod
+    def for_host(cls, base_url: str, **config: Any) -> "CircuitBreaker":
+        """Instance partagée par `scheme://host[:port]` (config prise à la 1re création)."""
+        parts = urlsplit(base_url)
+        key = f"{parts.scheme}://{parts.netloc}" if parts.netloc else base_url
+        with cls._registry_lock:
+            breaker = cls._registry.get(key)
+            if breaker is None:
+                breaker = cls(key, **config)
+                cls._registry[key] = breaker
+            return breaker
+
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            self._maybe_half_open(time.monotonic())
+            return self._state
+
+    def before_call(self) -> None:
+        """À appeler avant chaque requête: lève CircuitOpenError si le circuit refuse."""
+        with self._lock:
+            now = time.monotonic()
+            self._maybe_half_open(now)
+
+            if self._state is CircuitState.OPEN:
+                remaining = self._opened_at + self.open_duration_s - now
+                raise CircuitOpenError(self.name, retry_after=max(remaining, 0.0))
+
+            if self._state is CircuitState.HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_max_calls:
+                    raise CircuitOpenError(self.name, retry_after=0.0)
+                self._probes_in_flight += 1
+
+    def record_success(self) -> None:
+        self._record(failed=False)
+
+    def record_failure(self) -> None:
+        self._record(failed=True)
+
+    def release(self) -> None:
+        """Appel abandonné avant d'atteindre l'hôte: libère la sonde sans verdict."""
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._to_closed()
+
+    # ----------------------------
+    # Internals (lock tenu)
+    # ----------------------------
+    def _record(self, failed: bool) -> None:
+        with self._lock:
+            now = time.monotonic()
+
+            if self._state is CircuitState.HALF_OPEN:
+                self._probes_in_flight = max(self._probes_in_flight - 1, 0)
+                if failed:
+                    self._to_open(now)
+                else:
+                    self._to_closed()
+                return
+
+            if self._state is CircuitState.OPEN:
+                # Réponse d'un appel parti avant l'ouverture: ignorée
+                return
+
+            self._outcomes.append((now, failed))
+            self._trim(now)
+            total = len(self._outcomes)
+            if total < self.minimum_calls:
+                return
+            failures = sum(1 for _, f in self._outcomes if f)
+            if failures / total >= self.failure_rate_threshold:
+                self._to_open(now)
+
+    def _trim(self, now: float) -> None:
+        horizon = now - self.window_s
+        while self._outcomes and self._outcomes[0][0] < horizon:
+            self._outcomes.popleft()
+
+    def _maybe_half_open(self, now: float) -> None:
+        if self._state is CircuitState.OPEN and now - self._opened_at >= self.open_duration_s:
+            self._state = CircuitState.HALF_OPEN
+            self._probes_in_flight = 0
+
+    def _to_open(self, now: float) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = now
+        self._outcomes.clear()
+
+    def _to_closed(self) -> None:
+        self._state = CircuitState.CLOSED
+        self._outcomes.clear()
+        self._probes_in_flight = 0
+
+
+def is_breaker_failure(status_code: int) -> bool:
+    """Erreur réseau (0) ou 5xx = l'hôte va mal. 4xx/429 = l'hôte répond: succès."""
+    return status_code == 0 or status_code >= 500
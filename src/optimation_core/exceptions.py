@@ -34,3 +34,17 @@ class ApiError(ConnectorError):
 
 class RateLimitError(ConnectorError):
     """Erreur de limite (429, quota, throttling)."""
+
+    def __init__(self, message: str = "", *, retry_after: Optional[float] = None) -> None:
+        super().__init__(message)
+        # Délai suggéré par le serveur (header Retry-After), en secondes
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(ConnectorError):
+    """Circuit ouvert pour un hôte: échec immédiat sans appel réseau."""
+
+    def __init__(self, name: str, *, retry_after: Optional[float] = None) -> None:
+        super().__init__(f"Circuit open for {name} (retry in {retry_after or 0:.1f}s)")
+        self.name = name
+        self.retry_after = retry_after
@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Iterable, Iterator, Optional
+
+try:  # backend C optionnel: pip install optimation-python-sdk[json]
+    import ijson
+except ImportError:
+    ijson = None
+
+_WS = " \t\r\n"
+_NUMBER_END = _WS + ",]}"
+
+# États du parseur
+_START = 0
+_OBJ_FIRST = 1
+_OBJ_KEY = 2
+_OBJ_COLON = 3
+_OBJ_SKIP = 4
+_OBJ_NEXT = 5
+_ARRAY_OPEN = 6
+_ARRAY_FIRST = 7
+_ARRAY_ITEM = 8
+_ARRAY_NEXT = 9
+_DONE = 10
+
+
+class JsonArrayStream:
+    """
+    Décodeur JSON incrémental (push): on lui donne des chunks d'octets, il rend
+    les éléments du tableau `key` (ex: {"results": [...]}) dès qu'ils sont complets.
+    key=None: le document est directement un tableau.
+    Seul le texte non consommé reste en mémoire (jamais le body complet).
+    """
+
+    def __init__(self, key: Optional[str] = "results") -> None:
+        self.key = key
+        self._decoder = json.JSONDecoder()
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._state = _START
+        self._in_object = False
+        self._current_key: Any = None
+
+    def feed(self, chunk: bytes) -> list[Any]:
+        self._append(self._utf8.decode(chunk))
+        return self._drain()
+
+    def close(self) -> list[Any]:
+        self._append(self._utf8.decode(b"", final=True))
+        self._eof = True
+        items = self._drain()
+        if self._state != _DONE:
+            raise ValueError("Truncated JSON stream")
+        return items
+
+    def _append(self, text: str) -> None:
+        self._buf = self._buf[self._pos:] + text
+        self._pos = 0
+
+    def _drain(self) -> list[Any]:
+        out: list[Any] = []
+        while self._state != _DONE:
+            buf = self._buf
+            while self._pos < len(buf) and buf[self._pos] in _WS:
+                self._pos += 1
+            if self._pos >= len(buf):
+                break
+            c = buf[self._pos]
+            state = self._state
+
+            if state == _START:
+                if c == "[":
+                    self._pos += 1
+                    self._state = _ARRAY_FIRST
+                elif c == "{" and self.key is not None:
+                    self._pos += 1
+                    self._in_object = True
+                    self._state = _OBJ_FIRST
+                else:
+                    raise ValueError(f"Unexpected JSON start: {c!r}")
+
+            elif state == _OBJ_FIRST:
+                if c == "}":
+                    self._pos += 1
+                    self._state = _DONE
+                else:
+                    self._state = _OBJ_KEY
+
+            elif state == _OBJ_KEY:
+                ok, value = self._value()
+                if not ok:
+                    break
+                self._current_key = value
+                self._state = _OBJ_COLON
+
+            elif state == _OBJ_COLON:
+                self._expect(c, ":")
+                self._state = _ARRAY_OPEN if self._current_key == self.key else _OBJ_SKIP
+
+            elif state == _ARRAY_OPEN:
+                if c == "[":
+                    self._pos += 1
+                    self._state = _ARRAY_FIRST
+                else:  # ex: "results": null
+                    self._state = _OBJ_SKIP
+
+            elif state == _OBJ_SKIP:
+                ok, _ = self._value()
+                if not ok:
+                    break
+                self._state = _OBJ_NEXT
+
+            elif state == _OBJ_NEXT:
+                if c == ",":
+                    self._pos += 1
+                    self._state = _OBJ_KEY
+                else:
+                    self._expect(c, "}")
+                    self._state = _DONE
+
+            elif state == _ARRAY_FIRST:
+                if c == "]":
+                    self._pos += 1
+                    self._state = _OBJ_NEXT if self._in_object else _DONE
+                else:
+                    self._state = _ARRAY_ITEM
+
+            elif state == _ARRAY_ITEM:
+                ok, value = self._value()
+                if not ok:
+                    break
+                out.append(value)
+                self._state = _ARRAY_NEXT
+
+            elif state == _ARRAY_NEXT:
+                if c == ",":
+                    self._pos += 1
+                    self._state = _ARRAY_ITEM
+                else:
+                    self._expect(c, "]")
+                    self._state = _OBJ_NEXT if self._in_object else _DONE
+        return out
+
+    def _value(self) -> tuple[bool, Any]:
+        try:
+            value, end = self._decoder.raw_decode(self._buf, self._pos)
+        except json.JSONDecodeError:
+            if self._eof:
+                raise
+            return False, None
+        # Un nombre peut être tronqué ("1." + "5"): il doit être suivi d'un délimiteur
+        if (
+            not self._eof
+            and isinstance(value, (int, float))
+            and not isinstance(value, bool)
+            and (end >= len(self._buf) or self._buf[end] not in _NUMBER_END)
+        ):
+            return False, None
+        self._pos = end
+        return True, value
+
+    def _expect(self, c: str, expected: str) -> None:
+        if c != expected:
+            raise ValueError(f"Expected {expected!r} in JSON stream, got {c!r}")
+        self._pos += 1
+
+
+def iter_json_array(
+    chunks: Iterable[bytes],
+    key: Optional[str] = "results",
+    *,
+    backend: str = "auto",
+) -> Iterator[Any]:
+    """
+    Itère les éléments du tableau `key` à partir d'un flux de chunks.
+    backend: "auto" (ijson si installé), "ijson" ou "python".
+    """
+    if backend == "ijson" or (backend == "auto" and ijson is not None):
+        if ijson is None:
+            raise ImportError("ijson is not installed (pip install optimation-python-sdk[json])")
+        reader = _ChunkReader(chunks)
+        # Comme le backend python: un body qui est directement un tableau est accepté avec `key`
+        prefix = f"{key}.item" if key and reader.first_byte() != b"[" else "item"
+        yield from ijson.items(reader, prefix, use_float=True)
+        return
+
+    parser = JsonArrayStream(key)
+    for chunk in chunks:
+        if chunk:
+            yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+class _ChunkReader:
+    """Adapte un itérable de chunks en objet fichier minimal (read) pour ijson."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._it = iter(chunks)
+        self._pending = b""
+
+    def first_byte(self) -> bytes:
+        """Premier octet hors blancs (b"" si flux vide), sans le consommer."""
+        while True:
+            data = self._pending.lstrip(b" \t\r\n")
+            if data:
+                return data[:1]
+            chunk = next(self._it, None)
+            if chunk is None:
+                return b""
+            self._pending += chunk
+
+    def read(self, size: int = -1) -> bytes:
+        while size < 0 or len(self._pending) < size:
+            chunk = next(self._it, None)
+            if chunk is None:
+                break
+            self._pending += chunk
+        if size < 0:
+            data, self._pending = self._pending, b""
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
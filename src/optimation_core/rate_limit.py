@@ -0,0 +1,230 @@
+from __future__ import annotations
+
+import os
+import time
+import asyncio
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+from .cache import default_cache_dir
+from .exceptions import RateLimitError
+from .sqlite import SqliteConnections
+
+
+class TokenBucket:
+    """
+    Token bucket in-process, thread-safe.
+    - capacity: taille du burst
+    - refill_per_s: jetons rendus par seconde
+    Ex: 10 req/s -> TokenBucket.per_second(10); 200k tokens/min -> TokenBucket.per_minute(200_000)
+    """
+
+    def __init__(self, capacity: float, refill_per_s: float) -> None:
+        if capacity <= 0 or refill_per_s <= 0:
+            raise ValueError("capacity and refill_per_s must be > 0")
+        self.capacity = float(capacity)
+        self.refill_per_s = float(refill_per_s)
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_second(cls, rate: float, *, burst: Optional[float] = None) -> "TokenBucket":
+        return cls(capacity=burst or rate, refill_per_s=rate)
+
+    @classmethod
+    def per_minute(cls, rate: float, *, burst: Optional[float] = None) -> "TokenBucket":
+        return cls(capacity=burst or rate, refill_per_s=rate / 60.0)
+
+    def try_acquire(self, cost: float = 1.0) -> float:
+        """Prend `cost` jetons si possible -> 0.0, sinon renvoie l'attente estimée (s)."""
+        cost = min(float(cost), self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.refill_per_s
+            )
+            self._updated = now
+            if self._tokens >= cost:
+                self._tokens -= cost
+                return 0.0
+            return (cost - self._tokens) / self.refill_per_s
+
+    def acquire(self, cost: float = 1.0, *, max_wait_s: Optional[float] = None) -> None:
+        _wait(self, cost, max_wait_s)
+
+    async def aacquire(self, cost: float = 1.0, *, max_wait_s: Optional[float] = None) -> None:
+        await _await(self, cost, max_wait_s)
+
+
+class SqliteTokenBucket:
+    """
+    Token bucket partagé entre process d'une même machine (état dans un fichier SQLite).
+    Tous les workers qui pointent sur le même `path` + `name` partagent le quota.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        capacity: float,
+        refill_per_s: float,
+        *,
+        path: str | os.PathLike[str] | None = None,
+        busy_timeout_s: float = 5.0,
+    ) -> None:
+        if capacity <= 0 or refill_per_s <= 0:
+            raise ValueError("capacity and refill_per_s must be > 0")
+        self.name = name
+        self.capacity = float(capacity)
+        self.refill_per_s = float(refill_per_s)
+        self.path = Path(path) if path else default_cache_dir() / "ratelimit.sqlite3"
+        self.busy_timeout_s = busy_timeout_s
+        self._db = SqliteConnections(self.path, busy_timeout_s=busy_timeout_s)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._conn()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS buckets ("
+            " name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+        )
+
+    @classmethod
+    def per_second(
+        cls,
+        name: str,
+        rate: float,
+        *,
+        burst: Optional[float] = None,
+        path: str | os.PathLike[str] | None = None,
+    ) -> "SqliteTokenBucket":
+        return cls(name, capacity=burst or rate, refill_per_s=rate, path=path)
+
+    @classmethod
+    def per_minute(
+        cls,
+        name: str,
+        rate: float,
+        *,
+        burst: Optional[float] = None,
+        path: str | os.PathLike[str] | None = None,
+    ) -> "SqliteTokenBucket":
+        return cls(name, capacity=burst or rate, refill_per_s=rate / 60.0, path=path)
+
+    def _conn(self) -> sqlite3.Connection:
+        return self._db.get()
+
+    def try_acquire(self, cost: float = 1.0) -> float:
+        cost = min(float(cost), self.capacity)
+        conn = self._conn()
+        # Horloge murale: partagée par tous les process (monotonic ne l'est pas partout)
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT tokens, updated FROM buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+            tokens = self.capacity if row is None else row[0]
+            elapsed = 0.0 if row is None else max(now - row[1], 0.0)
+            tokens = min(self.capacity, tokens + elapsed * self.refill_per_s)
+
+            wait = 0.0
+            if tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / self.refill_per_s
+
+            conn.execute(
+                "INSERT INTO buckets (name, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET tokens = excluded.tokens, "
+                "updated = excluded.updated",
+                (self.name, tokens, now),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return wait
+
+    def acquire(self, cost: float = 1.0, *, max_wait_s: Optional[float] = None) -> None:
+        _wait(self, cost, max_wait_s)
+
+    async def aacquire(self, cost: float = 1.0, *, max_wait_s: Optional[float] = None) -> None:
+        # Transaction SQLite (jusqu'à busy_timeout_s sous contention) hors de la boucle
+        await _await(self, cost, max_wait_s, in_thread=True)
+
+
+Bucket = TokenBucket | SqliteTokenBucket
+
+
+class RateLimiter:
+    """
+    Combine un bucket "requêtes" et un bucket "tokens" (les deux optionnels).
+    Chaque appel consomme 1 requête + `tokens` tokens (estimation côté appelant).
+
+        limiter = RateLimiter(
+            requests=TokenBucket.per_second(5),
+            tokens=SqliteTokenBucket.per_minute("openai:tpm", 200_000),
+        )
+        limiter.acquire(tokens=1200)
+    """
+
+    def __init__(
+        self,
+        *,
+        requests: Optional[Bucket] = None,
+        tokens: Optional[Bucket] = None,
+        max_wait_s: Optional[float] = None,
+    ) -> None:
+        self.requests = requests
+        self.tokens = tokens
+        self.max_wait_s = max_wait_s
+
+    def acquire(self, tokens: float = 0) -> None:
+        if self.requests is not None:
+            self.requests.acquire(1, max_wait_s=self.max_wait_s)
+        if self.tokens is not None and tokens > 0:
+            self.tokens.acquire(tokens, max_wait_s=self.max_wait_s)
+
+    async def aacquire(self, tokens: float = 0) -> None:
+        if self.requests is not None:
+            await self.requests.aacquire(1, max_wait_s=self.max_wait_s)
+        if self.tokens is not None and tokens > 0:
+            await self.tokens.aacquire(tokens, max_wait_s=self.max_wait_s)
+
+
+def estimate_tokens(*texts: Optional[str]) -> int:
+    """Estimation grossière (~4 caractères par token), suffisante pour un budget."""
+    return sum(len(t) for t in texts if t) // 4 + 1
+
+
+def _wait(bucket: Bucket, cost: float, max_wait_s: Optional[float]) -> None:
+    deadline = None if max_wait_s is None else time.monotonic() + max_wait_s
+    while True:
+        wait = bucket.try_acquire(cost)
+        if wait <= 0:
+            return
+        if deadline is not None and time.monotonic() + wait > deadline:
+            raise RateLimitError("Client-side rate limit: budget exhausted", retry_after=wait)
+        time.sleep(wait)
+
+
+async def _await(
+    bucket: Bucket,
+    cost: float,
+    max_wait_s: Optional[float],
+    *,
+    in_thread: bool = False,
+) -> None:
+    deadline = None if max_wait_s is None else time.monotonic() + max_wait_s
+    while True:
+        if in_thread:
+            wait = await asyncio.to_thread(bucket.try_acquire, cost)
+        else:
+            wait = bucket.try_acquire(cost)
+        if wait <= 0:
+            return
+        if deadline is not None and time.monotonic() + wait > deadline:
+            raise RateLimitError("Client-side rate limit: budget exhausted", retry_after=wait)
+        await asyncio.sleep(wait)
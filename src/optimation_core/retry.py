@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import time
+import random
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+@dataclass(frozen=True)
+class RetryAttempt:
+    """Trace d'une tentative (pour logs / métriques via `RetryPolicy.on_attempt`)."""
+    label: str
+    attempt: int
+    latency_ms: float
+    error: Optional[BaseException] = None
+    delay_s: Optional[float] = None  # None = pas de nouvelle tentative
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Politique de retry partagée (ApiClient, AsyncApiClient, connecteurs).
+    - backoff exponentiel avec "full jitter": uniform(0, min(max_delay, base * 2**n))
+    - `Retry-After` respecté quand le serveur le donne (plafonné à max_delay_s)
+    - deadline totale: on n'attend jamais au-delà de `deadline_s`
+    - idempotence: POST/PATCH ne sont retentés que sur 429 (requête non traitée)
+    """
+    max_attempts: int = 3
+    base_delay_s: float = 0.5
+    max_delay_s: float = 30.0
+    deadline_s: Optional[float] = None
+    retry_on_status: frozenset[int] = frozenset({429, 502, 503, 504})
+    retry_on_network_errors: bool = True
+    respect_retry_after: bool = True
+    on_attempt: Optional[Callable[[RetryAttempt], None]] = None
+
+    def backoff(self, attempt: int) -> float:
+        cap = min(self.max_delay_s, self.base_delay_s * (2 ** max(attempt - 1, 0)))
+        return random.uniform(0, cap)
+
+    def next_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if self.respect_retry_after and retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_delay_s)
+        return self.backoff(attempt)
+
+    def is_retryable(
+        self,
+        method: str,
+        status_code: int,
+        *,
+        idempotent: Optional[bool] = None,
+    ) -> bool:
+        """status_code=0: erreur réseau (même convention que ApiError)."""
+        if status_code == 0:
+            if not self.retry_on_network_errors:
+                return False
+        elif status_code not in self.retry_on_status:
+            return False
+
+        # 429: le serveur a refusé avant de traiter -> sûr même pour un POST
+        if status_code == 429:
+            return True
+        if idempotent is None:
+            idempotent = method.upper() in IDEMPOTENT_METHODS
+        return idempotent
+
+    def _schedule(
+        self,
+        attempt: int,
+        started: float,
+        error: BaseException,
+        retry_if: Callable[[BaseException], bool],
+        retry_after: Callable[[BaseException], Optional[float]],
+    ) -> Optional[float]:
+        if attempt >= self.max_attempts or not retry_if(error):
+            return None
+        delay = self.next_delay(attempt, retry_after(error))
+        if self.deadline_s is not None:
+            if (time.monotonic() - started) + delay > self.deadline_s:
+                return None
+        return delay
+
+    def _record(
+        self,
+        log: Optional[logging.Logger],
+        label: str,
+        attempt: int,
+        t0: float,
+        error: Optional[BaseException],
+        delay: Optional[float],
+    ) -> None:
+        latency_ms = (time.perf_counter() - t0) * 1000
+        if log is not None and error is not None:
+            if delay is not None:
+                log.warning(
+                    "%s: attempt %s/%s failed (%.0fms): %s -> retry in %.2fs",
+                    label, attempt, self.max_attempts, latency_ms, error, delay,
+                )
+            elif attempt > 1:
+                log.warning(
+                    "%s: attempt %s/%s failed (%.0fms): %s -> giving up",
+                    label, attempt, self.max_attempts, latency_ms, error,
+                )
+        if self.on_attempt is not None:
+            self.on_attempt(RetryAttempt(label, attempt, latency_ms, error, delay))
+
+    def call(
+        self,
+        fn: Callable[[], T],
+        *,
+        retry_if: Callable[[BaseException], bool],
+        retry_after: Callable[[BaseException], Optional[float]] = lambda e: None,
+        label: str = "call",
+        log: Optional[logging.Logger] = None,
+    ) -> T:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            t0 = time.perf_counter()
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._schedule(attempt, started, e, retry_if, retry_after)
+                self._record(log, label, attempt, t0, e, delay)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            self._record(log, label, attempt, t0, None, None)
+            return result
+
+    async def acall(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        *,
+        retry_if: Callable[[BaseException], bool],
+        retry_after: Callable[[BaseException], Optional[float]] = lambda e: None,
+        label: str = "call",
+        log: Optional[logging.Logger] = None,
+    ) -> T:
+        started = time.monotonic()
+        attempt = 0
+        while True:
+            attempt += 1
+            t0 = time.perf_counter()
+            try:
+                result = await fn()
+            except Exception as e:
+                delay = self._schedule(attempt, started, e, retry_if, retry_after)
+                self._record(log, label, attempt, t0, e, delay)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self._record(log, label, attempt, t0, None, None)
+            return result
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """`Retry-After` HTTP: nombre de secondes ou date HTTP. None si illisible."""
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
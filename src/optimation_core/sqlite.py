@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+
+class SqliteConnections:
+    """
+    Connexions SQLite partagées par les caches/index du SDK (fichier commun à plusieurs process).
+    - une connexion par thread, rouverte après un fork (pas de partage entre process)
+    - autocommit (isolation_level=None), WAL: lecteurs et écrivain ne se bloquent pas
+    - synchronous=NORMAL: sûr en WAL, sans fsync à chaque commit
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        *,
+        busy_timeout_s: float = 5.0,
+    ) -> None:
+        self.path = Path(path)
+        self.busy_timeout_s = busy_timeout_s
+        self._local = threading.local()
+
+    def get(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout_s, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    @contextmanager
+    def immediate(self) -> Iterator[sqlite3.Connection]:
+        """Transaction BEGIN IMMEDIATE (verrou d'écriture pris d'entrée), COMMIT ou ROLLBACK."""
+        conn = self.get()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
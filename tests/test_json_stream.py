@@ -0,0 +1,43 @@
+import json
+
+import pytest
+
+from optimation_core import json_stream
+from optimation_core.json_stream import iter_json_array
+
+ROWS = [{"objectId": "a", "n": 1, "x": 1.5}, {"objectId": "b", "n": None, "s": "é]},"}]
+
+BACKENDS = [
+    "python",
+    pytest.param(
+        "ijson",
+        marks=pytest.mark.skipif(json_stream.ijson is None, reason="ijson is not installed"),
+    ),
+]
+
+
+def _chunks(body: bytes, size: int) -> list[bytes]:
+    return [body[i:i + size] for i in range(0, len(body), size)]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("chunk_size", [1, 7, 4096])
+@pytest.mark.parametrize(
+    "body, key",
+    [
+        ({"count": 2, "results": ROWS, "after": {"k": [1]}}, "results"),
+        (ROWS, "results"),  # key fourni mais body directement un tableau
+        (ROWS, None),
+    ],
+    ids=["object", "root-array-with-key", "root-array"],
+)
+def test_iter_json_array_shapes(backend, chunk_size, body, key):
+    raw = b"  \n" + json.dumps(body, ensure_ascii=False).encode("utf-8")
+    items = list(iter_json_array(_chunks(raw, chunk_size), key, backend=backend))
+    assert items == ROWS
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_iter_json_array_empty(backend):
+    assert list(iter_json_array([b'{"results": []}'], backend=backend)) == []
+    assert list(iter_json_array([b"[]"], backend=backend)) == []
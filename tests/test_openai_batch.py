@@ -0,0 +1,45 @@
+from typing import Optional
+
+from openai import OpenAI
+from pydantic import BaseModel
+
+from optimation_connectors.openai.batch import BATCH_ENDPOINT, OcrBatchApi
+
+
+class Line(BaseModel):
+    sku: str
+    qty: int = 1
+
+
+class Invoice(BaseModel):
+    number: str
+    total: Optional[float] = None
+    lines: list[Line]
+
+
+def test_build_requests_structured_format():
+    api = OcrBatchApi(client=OpenAI(api_key="test"))
+    [request] = api.build_requests({"inv-1": {"url": "https://example.com/a.pdf"}}, schema=Invoice)
+
+    assert request["custom_id"] == "inv-1"
+    assert request["url"] == BATCH_ENDPOINT
+    fmt = request["body"]["text"]["format"]
+    assert fmt["type"] == "json_schema"
+    assert fmt["name"] == "Invoice"
+    assert fmt["strict"] is True
+
+    schema = fmt["schema"]
+    assert schema["additionalProperties"] is False
+    assert schema["required"] == ["number", "total", "lines"]
+    assert "default" not in schema["properties"]["total"]
+    line = schema["$defs"]["Line"]
+    assert line["additionalProperties"] is False
+    assert line["required"] == ["sku", "qty"]
+
+
+def test_build_requests_plain_text():
+    api = OcrBatchApi(client=OpenAI(api_key="test"))
+    requests = list(api.build_requests([{"url": "https://example.com/a.pdf"}]))
+
+    assert [r["custom_id"] for r in requests] == ["doc-0"]
+    assert "text" not in requests[0]["body"]
@@ -0,0 +1,54 @@
+import asyncio
+import json
+
+import pytest
+from openai import AsyncOpenAI, OpenAI
+
+from optimation_connectors.openai.exceptions import OcrInputError
+from optimation_connectors.openai.ocr import AsyncOcrApi, OcrApi, _StreamOutput
+
+PDF = b"%PDF-1.4\n" + b"0" * 4096
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("OPTIMATION_CACHE_DIR", str(tmp_path))
+
+
+@pytest.mark.parametrize("conflict", [{"file_id": "file-1"}, {"url": "https://example.com/a.pdf"}])
+@pytest.mark.parametrize("local", [{"document": PDF}, {"base64_data": "JVBERi0xLjQK"}])
+def test_local_source_conflicts_with_remote_input(local, conflict):
+    ocr = OcrApi(client=OpenAI(api_key="test"), upload_threshold_bytes=1)
+    with pytest.raises(OcrInputError):
+        ocr.extract_data(**local, **conflict)
+
+
+def test_local_source_conflicts_with_file_id_async():
+    ocr = AsyncOcrApi(client=AsyncOpenAI(api_key="test"), upload_threshold_bytes=1)
+    with pytest.raises(OcrInputError):
+        asyncio.run(ocr.extract_data(document=PDF, file_id="file-1"))
+
+
+def test_stream_output_partials_are_throttled():
+    doc = json.dumps({"pages": [{"n": i, "text": "lorem ipsum " * 20} for i in range(200)]})
+    deltas = [doc[i:i + 4] for i in range(0, len(doc), 4)]
+    output = _StreamOutput(dict)
+
+    events = [event for delta in deltas for event in output.feed(delta)]
+    events += output.finish()
+
+    partials = [event for event in events if event.type == "partial"]
+    assert 1 < len(partials) < 100  # décodages en nombre logarithmique, pas un par delta
+    assert partials[-1].value == json.loads(doc)
+    assert output.text == doc
+    deltas_seen = [event for event in events if event.type == "delta"]
+    assert len(deltas_seen) == len(deltas)
+    assert deltas_seen[9].text == doc[:40]
+    assert deltas_seen[-1].text == doc
+
+
+def test_stream_output_without_schema_never_parses():
+    output = _StreamOutput(None)
+    events = output.feed('{"a": 1}') + output.finish()
+    assert [event.type for event in events] == ["delta"]
+    assert events[0].text == '{"a": 1}'
@@ -0,0 +1,53 @@
+import random
+
+import pytest
+
+from optimation_connectors.parse.scan import _OBJECT_ID_ALPHABET, _object_id_shards
+
+
+def _matches(object_id: str, cond) -> bool:
+    if not isinstance(cond, dict):
+        return object_id == cond
+    checks = {
+        "$gt": lambda v: object_id > v,
+        "$gte": lambda v: object_id >= v,
+        "$lt": lambda v: object_id < v,
+        "$lte": lambda v: object_id <= v,
+    }
+    return all(checks[op](value) for op, value in cond.items())
+
+
+IDS = ["".join(random.Random(i).choices(_OBJECT_ID_ALPHABET, k=10)) for i in range(2000)]
+
+
+@pytest.mark.parametrize("shards", [1, 4, 7, 62])
+@pytest.mark.parametrize(
+    "bounds",
+    [
+        {},
+        {"$gte": "x"},
+        {"$gt": "G"},
+        {"$lt": "B"},
+        {"$gte": "H", "$lte": "c"},
+        {"$gt": "V", "$lt": "V0"},
+    ],
+)
+def test_object_id_shards_narrow_caller_bounds(shards, bounds):
+    where = {"status": "active", **({"objectId": bounds} if bounds else {})}
+    shard_wheres = _object_id_shards(where, shards)
+
+    assert all(shard["status"] == "active" for shard in shard_wheres)
+    # Chaque id accepté par l'appelant tombe dans exactement un shard, les autres dans aucun
+    for object_id in IDS:
+        hits = sum(_matches(object_id, shard.get("objectId", {})) for shard in shard_wheres)
+        assert hits == (1 if _matches(object_id, bounds) else 0)
+
+
+def test_object_id_shards_drop_empty_ranges():
+    shard_wheres = _object_id_shards({"objectId": {"$gte": "x"}}, 4)
+    assert shard_wheres == [{"objectId": {"$gte": "x"}}]
+
+
+def test_object_id_shards_exact_id():
+    where = {"objectId": "abc", "n": 1}
+    assert _object_id_shards(where, 8) == [where]